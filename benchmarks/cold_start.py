@@ -0,0 +1,93 @@
+"""Cold-start timing of the CLI against the local mock server.
+
+Runs ``main.py`` as a fresh process repeatedly, the way cron does, and
+reports wall-clock percentiles per command as JSON. Exits non-zero when the
+median of the accounts command misses the target:
+
+    python -m benchmarks.cold_start --runs 20 --target-ms 400
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median, quantiles
+from time import perf_counter, time
+
+from benchmarks.mock_server import MockServer, MockSettings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "help": ["--help"],
+    "accounts": ["accounts"],
+    "transactions": ["transactions", "KEY000000"],
+}
+
+
+def time_command(python: str, argv: list[str], env: dict[str, str]) -> float:
+    start = perf_counter()
+    _ = subprocess.run(
+        [python, os.path.join(ROOT, "main.py"), *argv],
+        env=env,
+        cwd=ROOT,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=400,
+        help="Median target for the accounts command (default: 400)",
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tokens, MockServer(
+        MockSettings(latency=args.latency, jitter=0)
+    ) as server:
+        with open(os.path.join(tokens, "token.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "access_token": "mock-access-token",
+                    "expires_at": int(time()) + 24 * 3600,
+                    "refresh_token": "mock-refresh-token",
+                },
+                f,
+            )
+        env = dict(
+            os.environ, BASE_URL=server.url, TOKEN_STORE="file", TOKEN_PATH=tokens
+        )
+        results = {}
+        for name, command in COMMANDS.items():
+            seconds = [
+                time_command(args.python, command, env) for _ in range(args.runs)
+            ]
+            results[name] = {
+                "median_ms": median(seconds) * 1000,
+                "p90_ms": quantiles(seconds, n=10)[-1] * 1000,
+                "min_ms": min(seconds) * 1000,
+            }
+
+    report = {
+        "python": args.python,
+        "runs": args.runs,
+        "target_ms": args.target_ms,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if results["accounts"]["median_ms"] <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
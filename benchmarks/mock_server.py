@@ -0,0 +1,293 @@
+"""Local stand-in for api.sparebank1.no used by the benchmarks.
+
+Serves the OAuth authorize (with simulated consent) and token endpoints and
+the accounts, balance, transaction and transfer endpoints with generated
+data. Latency, payload size and error/429 injection are configurable, so
+client behaviour can be measured without touching the real API.
+
+Run standalone with ``python -m benchmarks.mock_server --port 8000``.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlparse
+from zoneinfo import ZoneInfo
+
+OSLO = ZoneInfo("Europe/Oslo")
+
+
+@dataclass
+class MockSettings:
+    latency: float = 0.02
+    jitter: float = 0.01
+    accounts: int = 50
+    transactions_per_day: int = 5
+    description_size: int = 40
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 0.05
+
+
+def account_key(i: int) -> str:
+    return f"KEY{i:06d}"
+
+
+def account_number(i: int) -> str:
+    return f"1234{i:07d}"
+
+
+def generate_transactions(
+    settings: MockSettings, key: str, from_date: date, to_date: date
+) -> list[dict[str, Any]]:
+    transactions = []
+    day = from_date
+    description = "x" * settings.description_size
+    while day <= to_date:
+        timestamp = int(
+            datetime(day.year, day.month, day.day, tzinfo=OSLO).timestamp() * 1000
+        )
+        for i in range(settings.transactions_per_day):
+            transaction_id = f"{key}-{day.isoformat()}-{i}"
+            cents = zlib.crc32(transaction_id.encode()) % 200000 - 100000
+            transactions.append(
+                {
+                    "id": transaction_id,
+                    "date": timestamp,
+                    "amount": cents / 100,
+                    "currencyCode": "NOK",
+                    "description": description,
+                    "bookingStatus": "BOOKED",
+                    "accountKey": key,
+                    "typeCode": "VAR",
+                    "source": "HISTORIC",
+                }
+            )
+        day += timedelta(days=1)
+    transactions.reverse()
+    return transactions
+
+
+def handler_factory(settings: MockSettings, counts: dict[str, int]):
+    lock = threading.Lock()
+
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any):
+            pass
+
+        def send_body(
+            self, status: int, body: bytes, content_type: str = "application/json"
+        ):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_json(self, status: int, payload: Any):
+            self.send_body(status, json.dumps(payload).encode("utf-8"))
+
+        def inject(self) -> bool:
+            """Sleep for the configured latency and maybe answer with an error."""
+            with lock:
+                counts[self.command] = counts.get(self.command, 0) + 1
+            time.sleep(max(0.0, settings.latency + random.uniform(0, settings.jitter)))
+            roll = random.random()
+            if roll < settings.throttle_rate:
+                self.send_response(429)
+                self.send_header("Retry-After", str(settings.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return True
+            if roll < settings.throttle_rate + settings.error_rate:
+                self.send_json(503, {"errors": [{"code": "unavailable"}]})
+                return True
+            return False
+
+        def read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            body = self.read_body()
+            if path == "/oauth/token":
+                with lock:
+                    counts["token"] = counts.get("token", 0) + 1
+                return self.send_json(
+                    200,
+                    {
+                        "access_token": "mock-access-token",
+                        "expires_in": 3600,
+                        "refresh_token": "mock-refresh-token",
+                    },
+                )
+            if self.inject():
+                return
+            if path == "/personal/banking/accounts/balance":
+                number = json.loads(body or b"{}").get("accountNumber")
+                return self.send_json(
+                    200,
+                    {
+                        "accountNumber": number,
+                        "availableBalance": 1000.0,
+                        "bookedBalance": 1200.0,
+                        "currencyCode": "NOK",
+                    },
+                )
+            if path in (
+                "/personal/banking/transfer/debit",
+                "/personal/banking/transfer/creditcard/transferTo",
+                "/personal/banking/transfer/pension",
+            ):
+                payload = json.loads(body or b"{}")
+                return self.send_json(
+                    200,
+                    {
+                        "paymentId": f"{zlib.crc32(body):08x}",
+                        "status": "OK",
+                        "amount": payload.get("amount"),
+                    },
+                )
+            self.send_json(404, {"errors": [{"code": "not_found"}]})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/oauth/authorize":
+                # Simulated consent: redirect straight back with a code
+                query = parse_qs(url.query)
+                redirect = query["redirect_uri"][0]
+                params = urlencode(
+                    {
+                        "code": f"code-{random.getrandbits(64):x}",
+                        "state": query["state"][0],
+                    }
+                )
+                self.send_response(302)
+                self.send_header("Location", f"{redirect}?{params}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.inject():
+                return
+            path = url.path.removeprefix("/personal/banking")
+            query = parse_qs(url.query)
+            if path == "/accounts":
+                return self.send_json(
+                    200,
+                    {
+                        "accounts": [
+                            {
+                                "key": account_key(i),
+                                "accountNumber": account_number(i),
+                                "name": f"Account {i}",
+                                "balance": 1000.0,
+                                "availableBalance": 1000.0,
+                                "currencyCode": "NOK",
+                                "type": "USER",
+                            }
+                            for i in range(settings.accounts)
+                        ]
+                    },
+                )
+            if path in ("/transactions", "/transactions/classified"):
+                to_date = date.fromisoformat(
+                    query.get("toDate", [date.today().isoformat()])[0]
+                )
+                from_date = date.fromisoformat(
+                    query.get("fromDate", [(to_date - timedelta(days=30)).isoformat()])[
+                        0
+                    ]
+                )
+                transactions = []
+                for key in query.get("accountKey", []):
+                    transactions.extend(
+                        generate_transactions(settings, key, from_date, to_date)
+                    )
+                row_limit = int(query.get("rowLimit", [0])[0])
+                if row_limit:
+                    transactions = transactions[:row_limit]
+                if path.endswith("classified"):
+                    for transaction in transactions:
+                        transaction["classificationInput"] = {"id": 1}
+                return self.send_json(200, {"transactions": transactions})
+            if path == "/transactions/export":
+                key = query["accountKey"][0]
+                from_date = date.fromisoformat(query["fromDate"][0])
+                to_date = date.fromisoformat(query["toDate"][0])
+                lines = ["Dato;Beskrivelse;Rentedato;Inn;Ut;Til konto;Fra konto;"]
+                for t in generate_transactions(settings, key, from_date, to_date):
+                    day = datetime.fromtimestamp(t["date"] / 1000).strftime("%d.%m.%Y")
+                    amount = f"{abs(t['amount']):.2f}".replace(".", ",")
+                    inn, ut = (amount, "") if t["amount"] >= 0 else ("", f"-{amount}")
+                    lines.append(f"{day};{t['description']};{day};{inn};{ut};;;")
+                return self.send_body(
+                    200, "\r\n".join(lines).encode("utf-8"), "application/csv"
+                )
+            self.send_json(404, {"errors": [{"code": "not_found"}]})
+
+    return MockHandler
+
+
+class MockServer:
+    """The mock API server running on a background thread."""
+
+    def __init__(self, settings: MockSettings | None = None, port: int = 0):
+        self.settings = settings or MockSettings()
+        self.counts: dict[str, int] = {}
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", port), handler_factory(self.settings, self.counts)
+        )
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info: Any):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=MockSettings.latency)
+    parser.add_argument("--accounts", type=int, default=MockSettings.accounts)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    settings = MockSettings(
+        latency=args.latency,
+        accounts=args.accounts,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    server = MockServer(settings, args.port)
+    print(f"Mock SpareBank1 API listening on {server.url}")
+    server.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Offline benchmarks for SpareBank1API against the local mock server.
+
+Measures requests/second, per-request latency percentiles and peak traced
+memory for typical workloads, and prints the results as JSON so they can be
+compared between releases:
+
+    python -m benchmarks.run --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from datetime import date, timedelta
+from time import perf_counter, time
+from typing import Any, Callable
+
+from benchmarks.mock_server import MockServer, MockSettings, account_number
+from sparebank1api.api import SpareBank1API
+from sparebank1api.config import Config
+from sparebank1api.instrumentation import Metrics
+
+
+def make_client(
+    server: MockServer, pool_size: int, metrics: Metrics | None = None
+) -> SpareBank1API:
+    os.environ["BASE_URL"] = server.url
+    os.environ["POOL_MAXSIZE"] = str(pool_size)
+    api = SpareBank1API(Config(""), instrumentation=metrics)
+    api._base.token = {
+        "access_token": "mock-access-token",
+        "expires_at": int(time()) + 24 * 3600,
+        "refresh_token": "mock-refresh-token",
+    }
+    return api
+
+
+def list_accounts(api: SpareBank1API, args: argparse.Namespace) -> int:
+    items = 0
+    for _ in range(args.iterations):
+        items += len(api.accounts.list_accounts())
+    return items
+
+
+def bulk_balances(api: SpareBank1API, args: argparse.Namespace) -> int:
+    numbers = [account_number(i) for i in range(args.accounts)]
+    balances, errors = api.accounts.get_balances(numbers, args.concurrency)
+    return len(balances)
+
+
+def transaction_history(api: SpareBank1API, args: argparse.Namespace) -> int:
+    to_date = date.today()
+    from_date = to_date - timedelta(days=365 * args.years)
+    return sum(
+        1
+        for _ in api.transactions.iter_transactions(
+            ["KEY000000"],
+            from_date=from_date,
+            to_date=to_date,
+            max_concurrency=args.concurrency,
+        )
+    )
+
+
+def export_stream(api: SpareBank1API, args: argparse.Namespace) -> int:
+    to_date = date.today()
+    from_date = to_date - timedelta(days=365)
+    return sum(
+        1
+        for _ in api.transactions.iter_exported_transactions(
+            "KEY000000", from_date, to_date
+        )
+    )
+
+
+WORKLOADS: dict[str, Callable[[SpareBank1API, argparse.Namespace], int]] = {
+    "list_accounts": list_accounts,
+    "bulk_balances": bulk_balances,
+    "transaction_history": transaction_history,
+    "export_stream": export_stream,
+}
+
+
+def run_workload(
+    name: str, server: MockServer, args: argparse.Namespace
+) -> dict[str, Any]:
+    workload = WORKLOADS[name]
+    metrics = Metrics()
+    with make_client(server, args.concurrency, metrics) as api:
+        start = perf_counter()
+        items = workload(api, args)
+        seconds = perf_counter() - start
+
+    summary = metrics.summary()
+    requests = sum(
+        c["value"] for c in summary["counters"] if c["name"] == "requests_total"
+    )
+    statuses: dict[str, float] = {}
+    for c in summary["counters"]:
+        if c["name"] == "requests_total":
+            status = c["labels"]["status"]
+            statuses[status] = statuses.get(status, 0) + c["value"]
+    latency = {
+        f"{r['method']} {r['endpoint']}": r["latency"] for r in summary["requests"]
+    }
+    result: dict[str, Any] = {
+        "workload": name,
+        "items": items,
+        "seconds": seconds,
+        "requests": requests,
+        "requests_per_second": requests / seconds if seconds else None,
+        "statuses": statuses,
+        "latency": latency,
+        "retries": sum(
+            c["value"] for c in summary["counters"] if c["name"] == "retries_total"
+        ),
+    }
+
+    if args.memory:
+        with make_client(server, args.concurrency) as api:
+            tracemalloc.start()
+            workload(api, args)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "workloads", nargs="*", help=f"Any of {', '.join(WORKLOADS)} (default: all)"
+    )
+    parser.add_argument("--latency", type=float, default=MockSettings.latency)
+    parser.add_argument("--jitter", type=float, default=MockSettings.jitter)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument(
+        "--transactions-per-day", type=int, default=MockSettings.transactions_per_day
+    )
+    parser.add_argument(
+        "--description-size", type=int, default=MockSettings.description_size
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    parser.add_argument("--output", help="Write results to this file")
+    args = parser.parse_args(argv)
+    args.workloads = args.workloads or list(WORKLOADS)
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+
+    settings = MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        accounts=args.accounts,
+        transactions_per_day=args.transactions_per_day,
+        description_size=args.description_size,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    with MockServer(settings) as server:
+        results = [run_workload(name, server, args) for name in args.workloads]
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            _ = f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,6 @@
-import json
-from sparebank1api.config import Config
-from sparebank1api.api import SpareBank1API
-
-
-def main():
-    config = Config()
-    api = SpareBank1API(config)
-
-    api.authenticate()
-    accounts = api.accounts.list_accounts()
-    print(json.dumps(accounts, indent=2))
+import sys
 
+from sparebank1api.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -5,6 +5,7 @@ from .apierror import (
 
 if TYPE_CHECKING:
     from .client import BaseAPI
+    from .models import Account, Balance
 
 
 class AccountsAPI:
@@ -41,6 +42,12 @@ class AccountsAPI:
             raise APIError(response.status_code, response.text)
         return response.json().get("accounts", [])
 
+    def list_account_models(self, **kwargs: Any) -> "list[Account]":
+        """Like list_accounts, decoded into Account models."""
+        from .models import Account
+
+        return [Account.from_dict(a) for a in self.list_accounts(**kwargs)]
+
     def get_account_keys(self, account_numbers: list[str]):
         response = self.api.getApi(
             "accounts/keys",
@@ -56,11 +63,31 @@ class AccountsAPI:
             "accounts/balance",
             json={"accountNumber": account_number},
             headers={"Content-Type": self.API_VERSION, "Accept": self.API_VERSION},
+            idempotent=True,
         )
         if not response.ok:
             raise APIError(response.status_code, response.text)
         return response.json()
 
+    def get_balance_model(self, account_number: str) -> "Balance":
+        from .models import Balance
+
+        return Balance.from_dict(self.get_account_balance(account_number))
+
+    def get_balances(
+        self, account_numbers: list[str], max_concurrency: int = 8
+    ) -> tuple[dict[str, Any], dict[str, Exception]]:
+        """Fetch balances for many accounts in parallel.
+
+        Returns (balances, errors) keyed by account number. At most
+        max_concurrency requests are in flight at once.
+        """
+        from .concurrency import map_concurrent
+
+        return map_concurrent(
+            self.get_account_balance, account_numbers, max_concurrency
+        )
+
     def get_default_account(self):
         response = self.api.getApi(
             "accounts/default", headers={"Accept": self.API_VERSION}
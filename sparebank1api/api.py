@@ -1,26 +1,84 @@
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+from .cache import ResponseCache
 from .client import BaseAPI
-from .accounts import AccountsAPI
-from .child_accounts import ChildAccountsAPI
-from .transactions import TransactionsAPI
-from .transfers import TransfersAPI
 
 from .config import Config
+from .instrumentation import Instrumentation
+from .tokenstore import TokenStore
+
+if TYPE_CHECKING:
+    from .accounts import AccountsAPI
+    from .child_accounts import ChildAccountsAPI
+    from .transactions import TransactionsAPI
+    from .transfers import TransfersAPI
 
 
 class SpareBank1API:
-    accounts: AccountsAPI
-    transactions: TransactionsAPI
-    transfers: TransfersAPI
-    child_accounts: ChildAccountsAPI
+    """Client for the personal banking endpoints.
+
+    The endpoint groups are created, and their modules imported, on first
+    access, so short-lived processes only load what they use.
+    """
+
     _base: BaseAPI
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        cache: ResponseCache | None = None,
+        instrumentation: Instrumentation | None = None,
+        token_store: TokenStore | None = None,
+        base: BaseAPI | None = None,
+    ):
         self.config = config
-        self._base = BaseAPI(config)
-        self.accounts = AccountsAPI(self._base)
-        self.transactions = TransactionsAPI(self._base)
-        self.transfers = TransfersAPI(self._base)
-        self.child_accounts = ChildAccountsAPI(self._base)
+        self._base = (
+            base
+            if base is not None
+            else BaseAPI(
+                config,
+                cache=cache,
+                instrumentation=instrumentation,
+                token_store=token_store,
+            )
+        )
+
+    @cached_property
+    def accounts(self) -> "AccountsAPI":
+        from .accounts import AccountsAPI
+
+        return AccountsAPI(self._base)
+
+    @cached_property
+    def transactions(self) -> "TransactionsAPI":
+        from .transactions import TransactionsAPI
+
+        return TransactionsAPI(self._base)
+
+    @cached_property
+    def transfers(self) -> "TransfersAPI":
+        from .transfers import TransfersAPI
+
+        return TransfersAPI(self._base)
+
+    @cached_property
+    def child_accounts(self) -> "ChildAccountsAPI":
+        from .child_accounts import ChildAccountsAPI
+
+        return ChildAccountsAPI(self._base)
 
     def authenticate(self):
         self._base.authenticate()
+
+    def start_token_refresher(self, lead_time: int = 300, interval: float = 30):
+        self._base.start_token_refresher(lead_time, interval)
+
+    def close(self):
+        self._base.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
@@ -0,0 +1,287 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date
+from functools import partial
+from typing import Any, Callable, Literal, TypeVar
+
+from .accounts import AccountsAPI
+from .child_accounts import ChildAccountsAPI
+from .cache import ResponseCache
+from .client import BaseAPI
+from .concurrency import gather_concurrent
+from .config import Config
+from .instrumentation import Instrumentation
+from .tokenstore import TokenStore
+from .transactions import TransactionsAPI
+from .transfers import TransfersAPI
+
+T = TypeVar("T")
+
+
+class AsyncBaseAPI:
+    """Runs BaseAPI calls off the event loop.
+
+    This is not native asyncio I/O: each call blocks a worker thread, so at
+    most max_workers requests (default: config.async_workers) are in flight
+    and the rest wait in the executor's queue. All calls share the pooled
+    session and token state of one BaseAPI; keep pool_maxsize at least
+    max_workers so every worker gets a kept-alive connection.
+    """
+
+    base: BaseAPI
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, base: BaseAPI, max_workers: int | None = None):
+        self.base = base
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or base.config.async_workers,
+            thread_name_prefix="sparebank1api",
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(copy_context().run, func, *args, **kwargs)
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.base.close()
+
+
+class AsyncAccountsAPI:
+    api: AsyncBaseAPI
+    _sync: AccountsAPI
+
+    def __init__(self, api: AsyncBaseAPI):
+        self.api = api
+        self._sync = AccountsAPI(api.base)
+
+    async def list_accounts(
+        self,
+        include_nok_accounts: bool = True,
+        include_currency_accounts: bool = False,
+        include_bsu_accounts: bool = False,
+        include_creditcard_accounts: bool = False,
+        include_ask_accounts: bool = False,
+        include_pension_accounts: bool = False,
+    ) -> list[dict[str, Any]]:
+        return await self.api.run(
+            self._sync.list_accounts,
+            include_nok_accounts=include_nok_accounts,
+            include_currency_accounts=include_currency_accounts,
+            include_bsu_accounts=include_bsu_accounts,
+            include_creditcard_accounts=include_creditcard_accounts,
+            include_ask_accounts=include_ask_accounts,
+            include_pension_accounts=include_pension_accounts,
+        )
+
+    async def get_account_keys(self, account_numbers: list[str]):
+        return await self.api.run(self._sync.get_account_keys, account_numbers)
+
+    async def get_account_balance(self, account_number: str):
+        return await self.api.run(self._sync.get_account_balance, account_number)
+
+    async def get_balances(
+        self, account_numbers: list[str], max_concurrency: int = 8
+    ) -> tuple[dict[str, Any], dict[str, Exception]]:
+        return await gather_concurrent(
+            self.get_account_balance, account_numbers, max_concurrency
+        )
+
+    async def get_default_account(self):
+        return await self.api.run(self._sync.get_default_account)
+
+    async def get_account(self, account_key: str):
+        return await self.api.run(self._sync.get_account, account_key)
+
+    async def get_account_roles(self, account_key: str):
+        return await self.api.run(self._sync.get_account_roles, account_key)
+
+    async def get_account_details(self, account_key: str):
+        return await self.api.run(self._sync.get_account_details, account_key)
+
+
+class AsyncTransactionsAPI:
+    api: AsyncBaseAPI
+    _sync: TransactionsAPI
+
+    def __init__(self, api: AsyncBaseAPI):
+        self.api = api
+        self._sync = TransactionsAPI(api.base)
+
+    async def list_transactions(
+        self,
+        account_keys: list[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+        row_limit: int | None = None,
+        transaction_source: list[Literal["RECENT", "HISTORIC", "ALL"]] | None = None,
+        enrich_with_payment_details: bool | None = None,
+    ):
+        return await self.api.run(
+            self._sync.list_transactions,
+            account_keys,
+            from_date=from_date,
+            to_date=to_date,
+            row_limit=row_limit,
+            transaction_source=transaction_source,
+            enrich_with_payment_details=enrich_with_payment_details,
+        )
+
+    async def export_transactions_to_csv(
+        self, account_key: str, from_date: date, to_date: date
+    ):
+        return await self.api.run(
+            self._sync.export_transactions_to_csv, account_key, from_date, to_date
+        )
+
+    async def list_classified_transactions(
+        self,
+        account_keys: list[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+        row_limit: int | None = None,
+        transaction_source: list[Literal["RECENT", "HISTORIC", "ALL"]] | None = None,
+        enrich_with_payment_details: bool | None = None,
+        enrich_with_merchant_logo: bool | None = None,
+    ):
+        return await self.api.run(
+            self._sync.list_classified_transactions,
+            account_keys,
+            from_date=from_date,
+            to_date=to_date,
+            row_limit=row_limit,
+            transaction_source=transaction_source,
+            enrich_with_payment_details=enrich_with_payment_details,
+            enrich_with_merchant_logo=enrich_with_merchant_logo,
+        )
+
+    async def get_transaction_details(self, transaction_id: str):
+        return await self.api.run(self._sync.get_transaction_details, transaction_id)
+
+    async def get_classified_transaction_details(
+        self, transaction_id: str, enrich_with_merchant_data: Any = None
+    ):
+        return await self.api.run(
+            self._sync.get_classified_transaction_details,
+            transaction_id,
+            enrich_with_merchant_data,
+        )
+
+
+class AsyncTransfersAPI:
+    api: AsyncBaseAPI
+    _sync: TransfersAPI
+
+    def __init__(self, api: AsyncBaseAPI):
+        self.api = api
+        self._sync = TransfersAPI(api.base)
+
+    async def transfer_to_credit_card(
+        self,
+        amount: float,
+        from_account: str,
+        credit_card_account_id: str,
+        due_date: date | None = None,
+    ):
+        return await self.api.run(
+            self._sync.transfer_to_credit_card,
+            amount,
+            from_account,
+            credit_card_account_id,
+            due_date=due_date,
+        )
+
+    async def transfer_between_accounts(
+        self,
+        amount: float,
+        from_account: str,
+        to_account: str,
+        currency_code: str = "NOK",
+        due_date: date | None = None,
+        message: str | None = None,
+    ):
+        return await self.api.run(
+            self._sync.transfer_between_accounts,
+            amount,
+            from_account,
+            to_account,
+            currency_code=currency_code,
+            due_date=due_date,
+            message=message,
+        )
+
+    async def transfer_to_pension(
+        self,
+        amount: float,
+        from_account: str,
+        policy_number: str,
+        due_date: date | None = None,
+    ):
+        return await self.api.run(
+            self._sync.transfer_to_pension,
+            amount,
+            from_account,
+            policy_number,
+            due_date=due_date,
+        )
+
+
+class AsyncChildAccountsAPI:
+    api: AsyncBaseAPI
+    _sync: ChildAccountsAPI
+
+    def __init__(self, api: AsyncBaseAPI):
+        self.api = api
+        self._sync = ChildAccountsAPI(api.base)
+
+    async def get_child_account(self, child_id: str):
+        return await self.api.run(self._sync.get_child_account, child_id)
+
+
+class AsyncSpareBank1API:
+    accounts: AsyncAccountsAPI
+    transactions: AsyncTransactionsAPI
+    transfers: AsyncTransfersAPI
+    child_accounts: AsyncChildAccountsAPI
+    _base: AsyncBaseAPI
+
+    def __init__(
+        self,
+        config: Config,
+        max_workers: int | None = None,
+        cache: ResponseCache | None = None,
+        instrumentation: Instrumentation | None = None,
+        token_store: TokenStore | None = None,
+    ):
+        self.config = config
+        self._base = AsyncBaseAPI(
+            BaseAPI(
+                config,
+                cache=cache,
+                instrumentation=instrumentation,
+                token_store=token_store,
+            ),
+            max_workers=max_workers,
+        )
+        self.accounts = AsyncAccountsAPI(self._base)
+        self.transactions = AsyncTransactionsAPI(self._base)
+        self.transfers = AsyncTransfersAPI(self._base)
+        self.child_accounts = AsyncChildAccountsAPI(self._base)
+
+    async def authenticate(self):
+        await self._base.run(self._base.base.authenticate)
+
+    def start_token_refresher(self, lead_time: int = 300, interval: float = 30):
+        self._base.base.start_token_refresher(lead_time, interval)
+
+    async def aclose(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._base.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info: Any):
+        await self.aclose()
@@ -0,0 +1,203 @@
+from abc import ABC, abstractmethod
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from time import time
+from typing import Any
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_TTLS: dict[str, float] = {
+    "accounts": 300,
+    "accounts/default": 300,
+    "accounts/keys": 3600,
+    "accounts/*/roles": 3600,
+    "accounts/*/details": 300,
+    "accounts/*": 300,
+}
+
+
+@dataclass
+class CacheEntry:
+    response: requests.Response
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class ResponseCache(ABC):
+    """Base class for GET response caches used by BaseAPI.getApi.
+
+    ttls maps endpoint patterns (relative to the API URL, ``*`` wildcards) to
+    a time to live in seconds. The first matching pattern wins; endpoints
+    without a match are not cached. Subclasses implement the storage.
+    """
+
+    ttls: dict[str, float]
+    stats: dict[str, int]
+
+    def __init__(self, ttls: dict[str, float] | None = None):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self._stats_lock = threading.Lock()
+
+    def ttl_for(self, endpoint: str) -> float:
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(endpoint, pattern):
+                return ttl
+        return 0
+
+    @staticmethod
+    def make_key(
+        namespace: str, url: str, params: Any = None, accept: str | None = None
+    ) -> str:
+        query = urlencode(params, doseq=True) if params else ""
+        return f"{namespace}\x1f{url}\x1f{query}\x1f{accept or ''}"
+
+    @staticmethod
+    def key_prefix(namespace: str, url_prefix: str) -> str:
+        return f"{namespace}\x1f{url_prefix}"
+
+    def record(self, stat: str, count: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += count
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry): ...
+
+    @abstractmethod
+    def invalidate(self, prefix: str = ""):
+        """Drop all entries whose key starts with prefix."""
+
+
+class MemoryCache(ResponseCache):
+    """In-memory LRU cache bounded to max_entries."""
+
+    _entries: OrderedDict[str, CacheEntry]
+
+    def __init__(self, ttls: dict[str, float] | None = None, max_entries: int = 1024):
+        super().__init__(ttls)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.record("evictions", evicted)
+
+    def invalidate(self, prefix: str = ""):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class DiskCache(ResponseCache):
+    """SQLite-backed cache that survives restarts, bounded to max_entries.
+
+    Only the status, response headers (without cookies) and body are
+    stored, never the request and its Authorization header; responses are
+    rebuilt from them on read.
+    """
+
+    def __init__(
+        self,
+        path: str = "cache.sqlite",
+        ttls: dict[str, float] | None = None,
+        max_entries: int = 10000,
+    ):
+        super().__init__(ttls)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            _ = self._db.execute(
+                "CREATE TABLE IF NOT EXISTS http_responses ("
+                " key TEXT PRIMARY KEY, url TEXT, status INTEGER NOT NULL,"
+                " headers TEXT NOT NULL, body BLOB NOT NULL, expires_at REAL NOT NULL,"
+                " etag TEXT, last_modified TEXT, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT url, status, headers, body, expires_at, etag, last_modified"
+                " FROM http_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            _ = self._db.execute(
+                "UPDATE http_responses SET accessed_at = ? WHERE key = ?",
+                (time(), key),
+            )
+        url, status, headers, body, expires_at, etag, last_modified = row
+        response = requests.Response()
+        response.url = url
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        return CacheEntry(response, expires_at, etag, last_modified)
+
+    def set(self, key: str, entry: CacheEntry):
+        response = entry.response
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() != "set-cookie"
+        }
+        with self._lock, self._db:
+            _ = self._db.execute(
+                "INSERT OR REPLACE INTO http_responses (key, url, status, headers,"
+                " body, expires_at, etag, last_modified, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    response.status_code,
+                    json.dumps(headers),
+                    response.content,
+                    entry.expires_at,
+                    entry.etag,
+                    entry.last_modified,
+                    time(),
+                ),
+            )
+            evicted = self._db.execute(
+                "DELETE FROM http_responses WHERE key IN (SELECT key FROM"
+                " http_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if evicted > 0:
+            self.record("evictions", evicted)
+
+    def invalidate(self, prefix: str = ""):
+        with self._lock, self._db:
+            _ = self._db.execute(
+                "DELETE FROM http_responses WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,251 @@
+"""Command line interface for SpareBank1API.
+
+Output is streamed as NDJSON (one JSON object per line) or CSV, written row
+by row as results arrive. Modules are imported by the subcommand that needs
+them, so ``--help`` and argument errors never load requests. Log messages
+from the client (token refreshes) go to stderr, keeping stdout parseable.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from .api import SpareBank1API
+
+
+def write_rows(
+    rows: Iterable[dict[str, Any]],
+    fmt: str,
+    out: IO[str],
+    columns: list[str] | None = None,
+) -> int:
+    """Write rows as NDJSON or CSV as they arrive, returning the row count.
+
+    The CSV header is columns, or else the fields of the first row, since
+    rows are not buffered. A later row with a field that is not in the
+    header raises ValueError rather than losing the field; missing fields
+    are left empty.
+    """
+    import json
+
+    count = 0
+    if fmt == "ndjson":
+        for row in rows:
+            _ = out.write(json.dumps(row, default=str, ensure_ascii=False))
+            _ = out.write("\n")
+            count += 1
+        return count
+
+    import csv
+
+    writer = None
+    header: set[str] = set()
+    for row in rows:
+        if writer is None:
+            fieldnames = columns or list(row)
+            header = set(fieldnames)
+            writer = csv.DictWriter(out, fieldnames=fieldnames)
+            writer.writeheader()
+        extra = row.keys() - header
+        if extra:
+            raise ValueError(
+                f"Row {count + 1} has fields not in the CSV header:"
+                f" {', '.join(sorted(extra))}; list all fields with --columns"
+            )
+        writer.writerow(
+            {
+                k: json.dumps(v, default=str) if isinstance(v, (dict, list)) else v
+                for k, v in row.items()
+            }
+        )
+        count += 1
+    return count
+
+
+def make_api(args: argparse.Namespace) -> "SpareBank1API":
+    from .api import SpareBank1API
+    from .config import Config
+
+    api = SpareBank1API(Config(args.config))
+    api.authenticate()
+    return api
+
+
+def account_keys(api: "SpareBank1API", args: argparse.Namespace) -> list[str]:
+    return args.accounts or [a["key"] for a in api.accounts.list_accounts()]
+
+
+def cmd_accounts(api: "SpareBank1API", args: argparse.Namespace, out: IO[str]):
+    return write_rows(api.accounts.list_accounts(), args.format, out, args.columns)
+
+
+def cmd_balances(api: "SpareBank1API", args: argparse.Namespace, out: IO[str]):
+    from .concurrency import iter_concurrent
+
+    numbers = args.accounts or [
+        a["accountNumber"] for a in api.accounts.list_accounts()
+    ]
+
+    def balances() -> Iterator[dict[str, Any]]:
+        # In completion order, so one slow account doesn't hold back the rest
+        for number, balance, error in iter_concurrent(
+            api.accounts.get_account_balance, numbers, args.concurrency
+        ):
+            if error is not None:
+                print(f"{number}: {error}", file=sys.stderr)
+            else:
+                yield balance
+
+    return write_rows(balances(), args.format, out, args.columns)
+
+
+def cmd_transactions(api: "SpareBank1API", args: argparse.Namespace, out: IO[str]):
+    errors: dict[str, Exception] = {}
+    count = write_rows(
+        api.transactions.iter_merged_transactions(
+            account_keys(api, args),
+            from_date=args.from_date,
+            to_date=args.to_date,
+            window_days=args.window_days,
+            max_concurrency=args.concurrency,
+            classified=args.classified,
+            errors=errors,
+        ),
+        args.format,
+        out,
+        args.columns,
+    )
+    for key, error in errors.items():
+        print(f"{key}: {error}", file=sys.stderr)
+    return count
+
+
+def cmd_export(api: "SpareBank1API", args: argparse.Namespace, out: IO[str]):
+    to_date = args.to_date or date.today()
+    if args.format == "csv":
+        # Pass the bank's CSV through untouched
+        out.flush()
+        return api.transactions.export_transactions_to_file(
+            args.account, args.from_date, to_date, out.buffer
+        )
+    return write_rows(
+        api.transactions.iter_exported_transactions(
+            args.account, args.from_date, to_date
+        ),
+        args.format,
+        out,
+        args.columns,
+    )
+
+
+def cmd_sync(api: "SpareBank1API", args: argparse.Namespace, out: IO[str]):
+    from .store import TransactionStore
+
+    with TransactionStore(args.database) as store:
+        changed = store.sync(
+            api.transactions,
+            account_keys(api, args),
+            args.from_date,
+            window_days=args.window_days,
+            max_concurrency=args.concurrency,
+        )
+    return write_rows(
+        ({"accountKey": k, "changed": n} for k, n in changed.items()),
+        args.format,
+        out,
+        args.columns or ["accountKey", "changed"],
+    )
+
+
+def parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def parse_columns(value: str) -> list[str]:
+    return [c.strip() for c in value.split(",") if c.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sparebank1", description="SpareBank1 personal banking API client."
+    )
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument(
+        "--columns",
+        type=parse_columns,
+        default=None,
+        help="Comma-separated CSV header (default: fields of the first row)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Parallel requests (default: 8)"
+    )
+    # Without a subcommand, list accounts as main.py always did
+    commands = parser.add_subparsers(dest="command")
+    parser.set_defaults(command="accounts")
+
+    _ = commands.add_parser("accounts", help="List accounts (default)")
+    balances = commands.add_parser("balances", help="Balances of accounts")
+    _ = balances.add_argument(
+        "accounts", nargs="*", help="Account numbers (default: all)"
+    )
+
+    default_from = date.today() - timedelta(days=30)
+    transactions = commands.add_parser(
+        "transactions", help="Transactions of accounts, merged by date"
+    )
+    _ = transactions.add_argument(
+        "accounts", nargs="*", help="Account keys (default: all)"
+    )
+    _ = transactions.add_argument("--classified", action="store_true")
+
+    export = commands.add_parser("export", help="CSV export of one account")
+    _ = export.add_argument("account", help="Account key")
+
+    sync = commands.add_parser("sync", help="Sync transactions into a SQLite store")
+    _ = sync.add_argument("database")
+    _ = sync.add_argument("accounts", nargs="*", help="Account keys (default: all)")
+
+    for command in (transactions, export, sync):
+        _ = command.add_argument(
+            "--from", dest="from_date", type=parse_date, default=default_from
+        )
+    for command in (transactions, export):
+        _ = command.add_argument("--to", dest="to_date", type=parse_date, default=None)
+    for command in (transactions, sync):
+        _ = command.add_argument(
+            "--window-days",
+            type=int,
+            default=31,
+            help="Days per request window (default: 31)",
+        )
+    return parser
+
+
+COMMANDS = {
+    "accounts": cmd_accounts,
+    "balances": cmd_balances,
+    "transactions": cmd_transactions,
+    "export": cmd_export,
+    "sync": cmd_sync,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    from contextlib import redirect_stdout
+
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    try:
+        with redirect_stdout(sys.stderr):
+            with make_api(args) as api:
+                _ = COMMANDS[args.command](api, args, out)
+        out.flush()
+    except BrokenPipeError:
+        # Output was piped into e.g. head; keep the interpreter's final flush quiet
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 1
+    return 0
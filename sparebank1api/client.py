@@ -1,21 +1,36 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
 from datetime import datetime
-from genericpath import exists
-import io
-import json
-from time import time
-from typing import Any, TypedDict, cast
+from hashlib import sha256
+import threading
+from time import perf_counter, time
+from typing import Any, Callable, NotRequired, TypedDict, cast
 import requests
+from requests.adapters import HTTPAdapter
 import secrets
 from urllib.parse import urlencode, urlparse, parse_qs
 
+from .cache import CacheEntry, ResponseCache
 from .config import Config
-from .server import wait_for_callback
+from .instrumentation import Instrumentation, endpoint_label, response_size
+from .scheduler import RequestScheduler
+from .timeouts import (
+    DEFAULT_TIMEOUTS,
+    DeadlineExceeded,
+    HedgePolicy,
+    Timeout,
+    bounded_timeout,
+    timeout_for,
+)
+from .tokenstore import DEFAULT_TOKEN_KEY, TokenStore, create_token_store
 
 
 class Token(TypedDict):
     access_token: str
     expires_at: int
     refresh_token: str
+    # Random id of the authorization the token belongs to, kept on refresh
+    grant_id: NotRequired[str]
 
 
 class ResponseToken(TypedDict):
@@ -30,13 +45,100 @@ class BaseAPI:
     TOKEN_URL: str = f"{BASE_URL}/oauth/token"
     API_URL: str = f"{BASE_URL}/personal/banking"
     config: Config
+    session: requests.Session
+    cache: ResponseCache | None
+    scheduler: RequestScheduler
+    instrumentation: Instrumentation | None
+    cache_namespace: str
+    token_store: TokenStore
+    token_key: str
     _last_state: str | None
+    coalesce: bool
+    timeouts: dict[str, Timeout]
+    default_timeout: Timeout
+    hedging: HedgePolicy | None
+    _hedge_pool: ThreadPoolExecutor | None
+    _inflight: dict[str, Future[requests.Response]]
+    _inflight_lock: threading.Lock
+    _token_lock: threading.RLock
+    _refresher: threading.Thread | None
+    _refresher_stop: threading.Event
 
     token: Token | None = None
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        instrumentation: Instrumentation | None = None,
+        token_store: TokenStore | None = None,
+        token_key: str = DEFAULT_TOKEN_KEY,
+    ):
         self.config = config
+        self.cache = cache
+        self.token_store = (
+            token_store if token_store is not None else create_token_store(config)
+        )
+        self.token_key = token_key
+        self.instrumentation = instrumentation
+        self.scheduler = (
+            scheduler
+            if scheduler is not None
+            else RequestScheduler(
+                rate=config.rate_limit,
+                burst=config.rate_burst,
+                max_retries=config.max_retries,
+            )
+        )
+        self.cache_namespace = config.client_id or ""
         self._last_state = None
+        if config.base_url:
+            self.BASE_URL = config.base_url.rstrip("/")
+            self.AUTH_URL = f"{self.BASE_URL}/oauth/authorize"
+            self.TOKEN_URL = f"{self.BASE_URL}/oauth/token"
+            self.API_URL = f"{self.BASE_URL}/personal/banking"
+        self._token_lock = threading.RLock()
+        self.coalesce = True
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.default_timeout = (config.connect_timeout, config.read_timeout)
+        self.hedging = None
+        self._hedge_pool = None
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._refresher = None
+        self._refresher_stop = threading.Event()
+        self._owns_session = session is None
+        self.session = session if session is not None else self.create_session(config)
+
+    @staticmethod
+    def create_session(config: Config) -> requests.Session:
+        """Create a keep-alive session with a pooled adapter sized from config."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    def close(self):
+        """Close pooled connections, unless the session was passed in by the caller."""
+        self.stop_token_refresher()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
 
     def build_headers(self, additional_headers: dict[str, str]) -> dict[str, str]:
         if not self.ensure_token():
@@ -55,32 +157,268 @@ class BaseAPI:
     ) -> requests.Response:
         if headers is None:
             headers = {}
-        return requests.get(url, headers=self.build_headers(headers), **kwargs)
+        return self.send("GET", url, headers, idempotent=True, **kwargs)
 
     def post(
-        self, url: str, headers: dict[str, str] | None = None, **kwargs: Any
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        idempotent: bool = False,
+        **kwargs: Any,
     ) -> requests.Response:
+        """POST through the scheduler.
+
+        Only pass idempotent=True for requests that are safe to repeat, such
+        as read-only lookups; transfers must never be retried blindly.
+        """
         if headers is None:
             headers = {}
 
-        return requests.post(url, headers=self.build_headers(headers), **kwargs)
+        return self.send("POST", url, headers, idempotent=idempotent, **kwargs)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        idempotent: bool,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request through the scheduler.
+
+        The (connect, read) timeout comes from timeouts, matched against the
+        endpoint label, unless one is passed in; it is shortened to fit the
+        current timeouts.deadline, and a timeout that fired because of the
+        deadline raises DeadlineExceeded. GETs matching the hedging policy
+        may be sent twice, returning the first response.
+        """
+        endpoint = endpoint_label(url)
+        timeout = kwargs.pop("timeout", None) or timeout_for(
+            endpoint, self.timeouts, self.default_timeout
+        )
+        instrumentation = self.instrumentation
+
+        def request(request_timeout: Timeout) -> requests.Response:
+            try:
+                return self.session.request(
+                    method,
+                    url,
+                    headers=self.build_headers(headers),
+                    timeout=request_timeout,
+                    **kwargs,
+                )
+            except requests.Timeout as e:
+                if request_timeout != timeout:  # cut short by the deadline
+                    raise DeadlineExceeded("Deadline exceeded.") from e
+                raise
+
+        def attempt() -> requests.Response:
+            request_timeout = bounded_timeout(timeout)
+            if instrumentation is None:
+                return request(request_timeout)
+            start = perf_counter()
+            try:
+                response = request(request_timeout)
+            except Exception as e:
+                instrumentation.on_error(method, endpoint, e)
+                raise
+            instrumentation.on_request(
+                method,
+                endpoint,
+                response.status_code,
+                perf_counter() - start,
+                response.elapsed.total_seconds(),
+                response_size(response, bool(kwargs.get("stream"))),
+            )
+            return response
+
+        def call() -> requests.Response:
+            return self.scheduler.send(
+                attempt,
+                idempotent=idempotent,
+                on_retry=(
+                    None
+                    if instrumentation is None
+                    else lambda: instrumentation.on_retry(endpoint)
+                ),
+            )
+
+        hedging = self.hedging
+        if (
+            hedging is None
+            or method != "GET"
+            or kwargs.get("stream")
+            or not hedging.applies(endpoint)
+        ):
+            return call()
+        return self._hedged(call, endpoint, hedging)
+
+    def _hedged(
+        self,
+        call: Callable[[], requests.Response],
+        endpoint: str,
+        hedging: HedgePolicy,
+    ) -> requests.Response:
+        start = perf_counter()
+        delay = hedging.delay(endpoint)
+        if delay is None:
+            response = call()
+            hedging.observe(endpoint, perf_counter() - start)
+            return response
+
+        with self._inflight_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=2 * self.config.pool_maxsize,
+                    thread_name_prefix="sparebank1api-hedge",
+                )
+            pool = self._hedge_pool
+        primary = pool.submit(copy_context().run, call)
+        done, _ = wait([primary], timeout=delay)
+        if done or not hedging.acquire():
+            response = primary.result()
+            hedging.observe(endpoint, perf_counter() - start)
+            return response
+
+        backup = pool.submit(copy_context().run, call)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        hedging.record_win()
+                    hedging.observe(endpoint, perf_counter() - start)
+                    return future.result()
+        return primary.result()
 
     def getApi(self, url: str, **kwargs: Any) -> requests.Response:
-        return self.get(f"{self.API_URL}/{url}", **kwargs)
+        """GET an endpoint relative to the API URL.
+
+        Concurrent identical calls (same URL, params, Accept header and token)
+        share one upstream request and its response unless coalesce is off or
+        the response is streamed. Callers still parse their own copy of the
+        body, so results can be modified safely.
+        """
+        if not self.coalesce or kwargs.get("stream"):
+            return self._get_api(url, **kwargs)
+        headers = kwargs.get("headers") or {}
+        key = "\x1f".join(
+            (
+                self.token["access_token"] if self.token else "",
+                ResponseCache.make_key(
+                    self.cache_namespace,
+                    url,
+                    kwargs.get("params"),
+                    headers.get("Accept"),
+                ),
+            )
+        )
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._inflight[key] = Future()
+        if not leader:
+            if self.instrumentation is not None:
+                self.instrumentation.on_cache(endpoint_label(url), "coalesced")
+            return flight.result()
+
+        try:
+            response = self._get_api(url, **kwargs)
+        except BaseException as e:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.set_exception(e)
+            raise
+        with self._inflight_lock:
+            del self._inflight[key]
+        flight.set_result(response)
+        return response
+
+    def _get_api(self, url: str, **kwargs: Any) -> requests.Response:
+        ttl = self.cache.ttl_for(url) if self.cache and not kwargs.get("stream") else 0
+        if not ttl:
+            return self.get(f"{self.API_URL}/{url}", **kwargs)
+        return self._cached_get(url, ttl, **kwargs)
+
+    def _cached_get(self, url: str, ttl: float, **kwargs: Any) -> requests.Response:
+        assert self.cache
+        headers = dict(kwargs.pop("headers", None) or {})
+        key = self.cache.make_key(
+            self.cache_scope(), url, kwargs.get("params"), headers.get("Accept")
+        )
+        entry = self.cache.get(key)
+        if entry is not None and entry.expires_at > time():
+            self.cache.record("hits")
+            if self.instrumentation is not None:
+                self.instrumentation.on_cache(endpoint_label(url), "hit")
+            return entry.response
+
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        response = self.get(f"{self.API_URL}/{url}", headers=headers, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self.cache.record("revalidated")
+            if self.instrumentation is not None:
+                self.instrumentation.on_cache(endpoint_label(url), "revalidated")
+            entry.expires_at = time() + ttl
+            self.cache.set(key, entry)
+            return entry.response
+
+        self.cache.record("misses")
+        if self.instrumentation is not None:
+            self.instrumentation.on_cache(endpoint_label(url), "miss")
+        if response.ok:
+            self.cache.set(
+                key,
+                CacheEntry(
+                    response=response,
+                    expires_at=time() + ttl,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                ),
+            )
+        return response
+
+    def cache_scope(self) -> str:
+        """Namespace of this client's cache keys.
+
+        cache_namespace plus the authorization the token belongs to, so a
+        cache shared between users, or kept on disk across restarts, never
+        serves one user's responses to another.
+        """
+        token = self.token
+        if not token:
+            return self.cache_namespace
+        grant = (
+            token.get("grant_id")
+            or sha256(token["refresh_token"].encode("utf-8")).hexdigest()[:16]
+        )
+        return f"{self.cache_namespace}/{grant}"
+
+    def invalidate_cache(self, url_prefix: str = ""):
+        """Drop cached responses for endpoints starting with url_prefix."""
+        if self.cache:
+            self.cache.invalidate(self.cache.key_prefix(self.cache_scope(), url_prefix))
 
     def postApi(self, url: str, **kwargs: Any) -> requests.Response:
         return self.post(f"{self.API_URL}/{url}", **kwargs)
 
     def authenticate(self):
-        if exists("token.json"):
-            with io.open("token.json", "r", encoding="utf-8") as f:
-                self.token = json.load(f)
-                assert self.token
-                print(
-                    f"Imported token, valid until {datetime.fromtimestamp(self.token['expires_at'])}"
-                )
-                _ = self.ensure_token()
-                return
+        token = self.token_store.load(self.token_key)
+        if token is not None:
+            self.token = token
+            print(
+                f"Imported token, valid until {datetime.fromtimestamp(token['expires_at'])}"
+            )
+            _ = self.ensure_token()
+            return
+
+        from .server import wait_for_callback
 
         url = self.get_authorization_url()
         print(f"Go to the following URL to authorize: {url}")
@@ -89,7 +427,7 @@ class BaseAPI:
         )["path"]
         self.fetch_token(redirect_response)
 
-    def set_token(self, response: requests.Response):
+    def set_token(self, response: requests.Response, grant_id: str | None = None):
         token = cast(ResponseToken, response.json())
         expiry = response.headers.get("date")
         expires_at = (
@@ -97,24 +435,23 @@ class BaseAPI:
             if expiry
             else datetime.now()
         )
-        self.token = {
-            "access_token": token.get("access_token"),
-            "expires_at": int(token.get("expires_in", 0)) + int(expires_at.timestamp()),
-            "refresh_token": token.get("refresh_token"),
-        }
+        with self._token_lock:
+            self.token = {
+                "access_token": token.get("access_token"),
+                "expires_at": int(token.get("expires_in", 0))
+                + int(expires_at.timestamp()),
+                "refresh_token": token.get("refresh_token"),
+                "grant_id": grant_id or secrets.token_hex(8),
+            }
 
-        print(
-            f"New token, valid until {datetime.fromtimestamp(self.token['expires_at'])}"
-        )
-        with io.open("token.json", "w", encoding="utf-8") as f:
-            _ = f.write(
-                json.dumps(
-                    self.token,
-                )
+            print(
+                f"New token, valid until {datetime.fromtimestamp(self.token['expires_at'])}"
             )
+            self.token_store.save(self.token_key, self.token)
 
-    def get_authorization_url(self):
-        state = secrets.token_urlsafe(16)
+    def get_authorization_url(self, state: str | None = None):
+        if state is None:
+            state = secrets.token_urlsafe(16)
         params = {
             "client_id": self.config.client_id,
             "redirect_uri": self.config.redirect_uri,
@@ -126,7 +463,9 @@ class BaseAPI:
         self._last_state = state
         return url
 
-    def fetch_token(self, authorization_response: str):
+    def fetch_token(
+        self, authorization_response: str, expected_state: str | None = None
+    ):
         # Extract code and state from the redirect URL
         parsed = urlparse(authorization_response)
         query = parse_qs(parsed.query)
@@ -134,10 +473,11 @@ class BaseAPI:
         state = query.get("state", [None])[0]
         if not code or not state:
             raise ValueError("Missing code or state in authorization response.")
-        if state != self._last_state:
+        if state != (expected_state or self._last_state):
             raise ValueError("State mismatch. Possible CSRF attack.")
-        response = requests.post(
+        response = self.session.post(
             self.TOKEN_URL,
+            timeout=bounded_timeout(self.default_timeout),
             data={
                 "grant_type": "authorization_code",
                 "code": code,
@@ -151,8 +491,9 @@ class BaseAPI:
 
     def refresh_token(self):
         assert self.token
-        response = requests.post(
+        response = self.session.post(
             self.TOKEN_URL,
+            timeout=bounded_timeout(self.default_timeout),
             data={
                 "client_id": self.config.client_id,
                 "client_secret": self.config.client_secret,
@@ -161,10 +502,16 @@ class BaseAPI:
             },
         )
         response.raise_for_status()
-        self.set_token(response)
+        self.set_token(response, self.token.get("grant_id"))
 
     def ensure_token(self, refresh_threshold: int = 60) -> bool:
-        """Check if the current token is valid."""
+        """Check if the current token is valid.
+
+        Refreshes are single-flight: concurrent callers wait for the refresh
+        in progress and reuse its token instead of issuing their own. The
+        token store is locked and re-read first, so a token already refreshed
+        by another client or process sharing the store is reused as well.
+        """
         if (
             not self.token
             or "access_token" not in self.token
@@ -173,8 +520,48 @@ class BaseAPI:
             raise Exception("Not authenticated. Please authenticate first.")
 
         if int(time()) >= self.token["expires_at"] - refresh_threshold:
-            self.refresh_token()
+            with self._token_lock, self.token_store.locked(self.token_key):
+                stored = self.token_store.load(self.token_key)
+                assert self.token
+                if (
+                    stored is not None
+                    and stored["expires_at"] > self.token["expires_at"]
+                ):
+                    self.token = stored
+                if int(time()) >= self.token["expires_at"] - refresh_threshold:
+                    start = perf_counter()
+                    self.refresh_token()
+                    if self.instrumentation is not None:
+                        self.instrumentation.on_token_refresh(perf_counter() - start)
             if not self.token or "access_token" not in self.token:
                 raise Exception("Failed to refresh token. Please re-authenticate.")
 
         return True
+
+    def start_token_refresher(self, lead_time: int = 300, interval: float = 30):
+        """Refresh the token in a background thread ahead of expiry.
+
+        The token is renewed once it is within lead_time seconds of expiring,
+        so request paths (which refresh at 60 seconds) never wait for it.
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+
+        def run():
+            while not self._refresher_stop.wait(interval):
+                try:
+                    _ = self.ensure_token(refresh_threshold=lead_time)
+                except Exception as e:
+                    print(f"Background token refresh failed: {e}")
+
+        self._refresher = threading.Thread(
+            target=run, name="sparebank1api-token-refresher", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_token_refresher(self):
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
@@ -0,0 +1,216 @@
+"""Columnar transaction history for analytics.
+
+Requires NumPy; Arrow/Parquet output additionally requires pyarrow. Input is
+consumed in chunks, so the full JSON history never has to sit in memory, and
+saved columns can be memory-mapped back from disk.
+"""
+
+import json
+import os
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Callable, Iterable
+
+from .models import SCALE, TransactionBatch, to_minor_units
+from .transactions import booking_date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TRANSACTION_DTYPE = [
+    ("date", "datetime64[D]"),
+    ("amount", "i8"),
+    ("account", "i4"),
+    ("category", "i4"),
+]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for columnar transactions.")
+
+
+def default_category(transaction: dict[str, Any]) -> str | None:
+    """Category name of a classified transaction, if any."""
+    category = transaction.get("category") or transaction.get("classificationInput")
+    if isinstance(category, dict):
+        category = category.get("name") or category.get("id")
+    return None if category is None else str(category)
+
+
+class _Table:
+    """Interns strings to small integer codes."""
+
+    def __init__(self, values: list[str] | None = None):
+        self.values = list(values or [])
+        self.codes = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class TransactionColumns:
+    """Transactions as a NumPy structured array.
+
+    Amounts are integer minor units (see models.SCALE), converted the same
+    way as in models.TransactionBatch; account and category are codes into
+    account_keys and categories (-1 when missing).
+    """
+
+    data: Any
+    account_keys: list[str]
+    categories: list[str]
+
+    def __init__(self, data: Any, account_keys: list[str], categories: list[str]):
+        _require_numpy()
+        self.data = data
+        self.account_keys = account_keys
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def from_transactions(
+        cls,
+        transactions: Iterable[dict[str, Any]],
+        category: Callable[[dict[str, Any]], str | None] = default_category,
+        chunk_size: int = 10000,
+    ) -> "TransactionColumns":
+        """Build columns from transaction dicts, converting chunk by chunk."""
+        _require_numpy()
+        accounts = _Table()
+        categories = _Table()
+        chunks = []
+        iterator = iter(transactions)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            batch = TransactionBatch.from_dicts(chunk)
+            # Batch account indexes -> codes into the shared account table
+            account_codes = np.array(
+                [accounts.code(k) for k in batch.account_keys], dtype="i4"
+            )
+            array = np.empty(len(chunk), dtype=TRANSACTION_DTYPE)
+            array["date"] = [booking_date(t) or "NaT" for t in chunk]
+            array["amount"] = np.frombuffer(batch.amounts, dtype="i8")
+            array["account"] = account_codes[
+                np.frombuffer(batch.account_index, dtype=batch.account_index.typecode)
+            ]
+            array["category"] = [categories.code(category(t)) for t in chunk]
+            chunks.append(array)
+        data = (
+            np.concatenate(chunks) if chunks else np.empty(0, dtype=TRANSACTION_DTYPE)
+        )
+        return cls(data, accounts.values, categories.values)
+
+    @classmethod
+    def from_pages(
+        cls, pages: Iterable[dict[str, Any]], **kwargs: Any
+    ) -> "TransactionColumns":
+        """Build columns from list_transactions/list_classified_transactions pages."""
+        return cls.from_transactions(
+            (t for page in pages for t in page.get("transactions", [])), **kwargs
+        )
+
+    @classmethod
+    def from_csv_records(
+        cls,
+        records: Iterable[dict[str, Any]],
+        account_key: str,
+        date_column: str = "Dato",
+        amount_columns: tuple[str, ...] = ("Inn", "Ut"),
+        chunk_size: int = 10000,
+    ) -> "TransactionColumns":
+        """Build columns from TransactionsAPI.iter_exported_transactions records."""
+        _require_numpy()
+        chunks = []
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            array = np.empty(len(chunk), dtype=TRANSACTION_DTYPE)
+            array["date"] = [r.get(date_column) or "NaT" for r in chunk]
+            array["amount"] = [
+                to_minor_units(
+                    sum((r.get(c) or Decimal(0) for c in amount_columns), Decimal(0))
+                )
+                for r in chunk
+            ]
+            array["account"] = 0
+            array["category"] = -1
+            chunks.append(array)
+        data = (
+            np.concatenate(chunks) if chunks else np.empty(0, dtype=TRANSACTION_DTYPE)
+        )
+        return cls(data, [account_key], [])
+
+    def _sum_by(self, codes: Any, labels: list[Any]) -> dict[Any, Decimal]:
+        valid = codes >= 0
+        totals = np.zeros(len(labels), dtype="i8")
+        np.add.at(totals, codes[valid], self.data["amount"][valid])
+        return {label: Decimal(int(t)) / SCALE for label, t in zip(labels, totals)}
+
+    def sum_by_account(self) -> dict[str, Decimal]:
+        return self._sum_by(self.data["account"], self.account_keys)
+
+    def sum_by_category(self) -> dict[str, Decimal]:
+        return self._sum_by(self.data["category"], self.categories)
+
+    def sum_by_month(self) -> dict[str, Decimal]:
+        months = self.data["date"].astype("datetime64[M]")
+        valid = ~np.isnat(months)
+        labels, codes = np.unique(months[valid], return_inverse=True)
+        all_codes = np.full(len(self.data), -1, dtype="i8")
+        all_codes[valid] = codes
+        return self._sum_by(all_codes, [str(m) for m in labels])
+
+    def save(self, directory: str):
+        """Save to directory as a .npy file plus a JSON file with the code tables."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "transactions.npy"), self.data)
+        with open(os.path.join(directory, "tables.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {"account_keys": self.account_keys, "categories": self.categories}, f
+            )
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "TransactionColumns":
+        """Load saved columns, memory-mapped read-only by default."""
+        _require_numpy()
+        data = np.load(
+            os.path.join(directory, "transactions.npy"), mmap_mode="r" if mmap else None
+        )
+        with open(os.path.join(directory, "tables.json"), encoding="utf-8") as f:
+            tables = json.load(f)
+        return cls(data, tables["account_keys"], tables["categories"])
+
+    def to_arrow(self):
+        """Convert to a pyarrow Table with decoded account keys and categories."""
+        import pyarrow as pa
+
+        accounts = np.array(self.account_keys + [None], dtype=object)
+        categories = np.array(self.categories + [None], dtype=object)
+        return pa.table(
+            {
+                "date": pa.array(self.data["date"]),
+                "amount": pa.array(self.data["amount"]),
+                "account_key": pa.array(accounts[self.data["account"]]),
+                "category": pa.array(categories[self.data["category"]]),
+            }
+        )
+
+    def write_parquet(self, path: str):
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
@@ -0,0 +1,72 @@
+import asyncio
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Awaitable, Callable, Hashable, Iterable, Iterator, TypeVar, cast
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+def iter_concurrent(
+    func: Callable[[K], T], keys: Iterable[K], max_concurrency: int = 8
+) -> Iterator[tuple[K, T | None, Exception | None]]:
+    """Call func once per unique key on a bounded thread pool.
+
+    Yields (key, result, None) or (key, None, error) as each call finishes. A
+    failing call does not abort the remaining calls, and closing the iterator
+    early cancels the calls that have not started. Calls run in a copy of the
+    caller's context, so a timeouts.deadline applies to them.
+    """
+    unique = list(dict.fromkeys(keys))
+    if not unique:
+        return
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(unique))))
+    try:
+        futures = {pool.submit(copy_context().run, func, key): key for key in unique}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                outcome = (key, future.result(), None)
+            except Exception as e:
+                outcome = (key, None, e)
+            yield outcome
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def map_concurrent(
+    func: Callable[[K], T], keys: Iterable[K], max_concurrency: int = 8
+) -> tuple[dict[K, T], dict[K, Exception]]:
+    """Collect iter_concurrent into (results, errors), both keyed by the input key."""
+    results: dict[K, T] = {}
+    errors: dict[K, Exception] = {}
+    for key, result, error in iter_concurrent(func, keys, max_concurrency):
+        if error is None:
+            results[key] = cast(T, result)
+        else:
+            errors[key] = error
+    return results, errors
+
+
+async def gather_concurrent(
+    func: Callable[[K], Awaitable[T]], keys: Iterable[K], max_concurrency: int = 8
+) -> tuple[dict[K, T], dict[K, Exception]]:
+    """Asyncio counterpart of map_concurrent, bounded by a semaphore."""
+    unique = list(dict.fromkeys(keys))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def call(key: K) -> T:
+        async with semaphore:
+            return await func(key)
+
+    outcomes = await asyncio.gather(*(call(k) for k in unique), return_exceptions=True)
+    results: dict[K, T] = {}
+    errors: dict[K, Exception] = {}
+    for key, outcome in zip(unique, outcomes):
+        if isinstance(outcome, Exception):
+            errors[key] = outcome
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results[key] = outcome
+    return results, errors
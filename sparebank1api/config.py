@@ -14,6 +14,20 @@ class Config:
             return self.config.get(section, key)
         return None
 
+    def _get_int(self, env: str, key: str, default: int) -> int:
+        value = os.getenv(env, self._get("DEFAULT", key))
+        return int(value) if value else default
+
+    def _get_float(self, env: str, key: str, default: float | None) -> float | None:
+        value = os.getenv(env, self._get("DEFAULT", key))
+        return float(value) if value else default
+
+    def _get_bool(self, env: str, key: str, default: bool) -> bool:
+        value = os.getenv(env, self._get("DEFAULT", key))
+        if not value:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
     @property
     def client_id(self):
         return os.getenv("CLIENT_ID", self._get("DEFAULT", "client_id"))
@@ -29,3 +43,62 @@ class Config:
     @property
     def fin_inst(self):
         return os.getenv("FIN_INST", self._get("DEFAULT", "fin_inst"))
+
+    @property
+    def base_url(self):
+        """Override the API host, e.g. to point the client at a local stub server."""
+        return os.getenv("BASE_URL", self._get("DEFAULT", "base_url"))
+
+    @property
+    def pool_connections(self) -> int:
+        """Number of per-host connection pools to keep."""
+        return self._get_int("POOL_CONNECTIONS", "pool_connections", 10)
+
+    @property
+    def pool_maxsize(self) -> int:
+        """Maximum number of kept-alive connections per host."""
+        return self._get_int("POOL_MAXSIZE", "pool_maxsize", 10)
+
+    @property
+    def pool_block(self) -> bool:
+        """Block when a host pool is exhausted instead of opening extra connections."""
+        return self._get_bool("POOL_BLOCK", "pool_block", False)
+
+    @property
+    def async_workers(self) -> int:
+        """Worker threads of AsyncSpareBank1API, i.e. its request concurrency."""
+        return self._get_int("ASYNC_WORKERS", "async_workers", self.pool_maxsize)
+
+    @property
+    def rate_limit(self) -> float | None:
+        """Maximum sustained requests per second, or None for no limit."""
+        return self._get_float("RATE_LIMIT", "rate_limit", None)
+
+    @property
+    def rate_burst(self) -> int:
+        return self._get_int("RATE_BURST", "rate_burst", 5)
+
+    @property
+    def max_retries(self) -> int:
+        """Retries for throttled or failed idempotent requests."""
+        return self._get_int("MAX_RETRIES", "max_retries", 3)
+
+    @property
+    def connect_timeout(self) -> float:
+        """Seconds to wait for a connection to the API."""
+        return self._get_float("CONNECT_TIMEOUT", "connect_timeout", None) or 5.0
+
+    @property
+    def read_timeout(self) -> float:
+        """Seconds to wait for response data, unless an endpoint overrides it."""
+        return self._get_float("READ_TIMEOUT", "read_timeout", None) or 30.0
+
+    @property
+    def token_store(self) -> str:
+        """Where tokens are kept: file (default), sqlite or memory."""
+        return os.getenv("TOKEN_STORE", self._get("DEFAULT", "token_store")) or "file"
+
+    @property
+    def token_path(self):
+        """Directory of the file token store, or database file of the sqlite store."""
+        return os.getenv("TOKEN_PATH", self._get("DEFAULT", "token_path"))
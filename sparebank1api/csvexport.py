@@ -0,0 +1,87 @@
+import codecs
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable, Iterator
+
+DATE_COLUMNS = ("Dato", "Rentedato", "Date", "Interest date")
+AMOUNT_COLUMNS = ("Inn", "Ut", "Beløp", "In", "Out", "Amount")
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+
+
+def parse_date(value: str) -> date | None:
+    value = value.strip()
+    if not value:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def parse_amount(value: str) -> Decimal | None:
+    """Parse amounts like "1 234,56" or "-12.50" into a Decimal."""
+    value = value.strip().replace("\xa0", "").replace(" ", "").replace(",", ".")
+    if not value:
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Unrecognised amount: {value!r}") from None
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = "utf-8-sig") -> Iterator[str]:
+    """Decode byte chunks into lines (with line endings) without joining them."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    tail = ""
+    for chunk in chunks:
+        text = tail + decoder.decode(chunk)
+        end = text.rfind("\n") + 1
+        tail = text[end:]
+        if end:
+            yield from io.StringIO(text[:end], newline="\n")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_csv_records(
+    chunks: Iterable[bytes],
+    encoding: str = "utf-8-sig",
+    delimiter: str | None = None,
+    date_columns: Iterable[str] = DATE_COLUMNS,
+    amount_columns: Iterable[str] = AMOUNT_COLUMNS,
+) -> Iterator[dict[str, Any]]:
+    """Parse a CSV export incrementally into typed records.
+
+    Each row becomes a dict keyed by the header, with date columns parsed to
+    date and amount columns to Decimal. The delimiter is detected from the
+    header line unless given.
+    """
+    lines = iter_lines(chunks, encoding)
+    header_line = next(lines, None)
+    if header_line is None:
+        return
+    if delimiter is None:
+        delimiter = ";" if header_line.count(";") >= header_line.count(",") else ","
+    header = next(csv.reader([header_line], delimiter=delimiter))
+    header = [h.strip() for h in header]
+    dates = set(date_columns)
+    amounts = set(amount_columns)
+    for row in csv.reader(lines, delimiter=delimiter):
+        if not any(row):
+            continue
+        record: dict[str, Any] = {}
+        for name, value in zip(header, row):
+            if not name:
+                continue
+            if name in dates:
+                record[name] = parse_date(value)
+            elif name in amounts:
+                record[name] = parse_amount(value)
+            else:
+                record[name] = value
+        yield record
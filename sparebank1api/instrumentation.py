@@ -0,0 +1,243 @@
+import json
+import re
+import threading
+from bisect import bisect_left
+from typing import Any
+
+import requests
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_ID_SEGMENT = re.compile(r"^[a-z]+$", re.IGNORECASE)
+
+
+def endpoint_label(url: str) -> str:
+    """Reduce a request URL to a low-cardinality endpoint label.
+
+    Accepts absolute URLs or paths relative to the API URL. Path segments
+    that look like keys or ids are replaced by ``{id}``, so
+    ``.../accounts/AB12CD/details`` becomes ``accounts/{id}/details``.
+    """
+    path = url.split("?", 1)[0]
+    segments = path.split("/")
+    if "://" in path:
+        segments = segments[3:]
+    if segments[:2] == ["personal", "banking"]:
+        segments = segments[2:]
+    return "/".join(s if _ID_SEGMENT.match(s) else "{id}" for s in segments if s)
+
+
+class Histogram:
+    """Fixed-bucket histogram with interpolated percentiles."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class Instrumentation:
+    """Hooks called by BaseAPI. Subclass and override the events you need.
+
+    BaseAPI only calls these when an instrumentation object is set, so there
+    is no overhead when instrumentation is disabled. requests does not expose
+    DNS, connect or TLS timings; ttfb is the time until the response headers
+    were parsed and seconds includes reading the body.
+    """
+
+    def on_request(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        seconds: float,
+        ttfb: float,
+        size: int | None,
+    ):
+        pass
+
+    def on_error(self, method: str, endpoint: str, error: Exception):
+        pass
+
+    def on_retry(self, endpoint: str):
+        pass
+
+    def on_token_refresh(self, seconds: float):
+        pass
+
+    def on_cache(self, endpoint: str, result: str):
+        pass
+
+
+class Metrics(Instrumentation):
+    """In-process aggregation of request metrics.
+
+    Exports latency histograms with p50/p95/p99 as JSON or in the Prometheus
+    text format.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.ttfb: dict[tuple[str, str], Histogram] = {}
+        self.token_refresh = Histogram(buckets)
+        self.counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def _inc(self, name: str, value: float = 1, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def on_request(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        seconds: float,
+        ttfb: float,
+        size: int | None,
+    ):
+        key = (method, endpoint)
+        with self._lock:
+            self.latency.setdefault(key, Histogram(self.buckets)).observe(seconds)
+            self.ttfb.setdefault(key, Histogram(self.buckets)).observe(ttfb)
+            self._inc(
+                "requests_total", method=method, endpoint=endpoint, status=str(status)
+            )
+            if size is not None:
+                self._inc(
+                    "response_bytes_total", size, method=method, endpoint=endpoint
+                )
+
+    def on_error(self, method: str, endpoint: str, error: Exception):
+        with self._lock:
+            self._inc(
+                "errors_total",
+                method=method,
+                endpoint=endpoint,
+                error=type(error).__name__,
+            )
+
+    def on_retry(self, endpoint: str):
+        with self._lock:
+            self._inc("retries_total", endpoint=endpoint)
+
+    def on_token_refresh(self, seconds: float):
+        with self._lock:
+            self.token_refresh.observe(seconds)
+            self._inc("token_refreshes_total")
+
+    def on_cache(self, endpoint: str, result: str):
+        with self._lock:
+            self._inc("cache_total", endpoint=endpoint, result=result)
+
+    def summary(self) -> dict[str, Any]:
+        def describe(histogram: Histogram) -> dict[str, Any]:
+            return {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "p50": histogram.percentile(50),
+                "p95": histogram.percentile(95),
+                "p99": histogram.percentile(99),
+            }
+
+        with self._lock:
+            return {
+                "requests": [
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "latency": describe(histogram),
+                        "ttfb": describe(self.ttfb[(method, endpoint)]),
+                    }
+                    for (method, endpoint), histogram in sorted(self.latency.items())
+                ],
+                "token_refresh": describe(self.token_refresh),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+            }
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.summary(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "sparebank1") -> str:
+        lines: list[str] = []
+
+        def labels(**values: str) -> str:
+            if not values:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in values.items()) + "}"
+
+        def histogram(name: str, h: Histogram, **label_values: str):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), h.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else str(bound)
+                lines.append(
+                    f"{name}_bucket{labels(**label_values, le=le)} {cumulative}"
+                )
+            lines.append(f"{name}_sum{labels(**label_values)} {h.sum}")
+            lines.append(f"{name}_count{labels(**label_values)} {h.count}")
+
+        with self._lock:
+            for metric, histograms in (
+                ("request_seconds", self.latency),
+                ("ttfb_seconds", self.ttfb),
+            ):
+                name = f"{prefix}_{metric}"
+                lines.append(f"# TYPE {name} histogram")
+                for (method, endpoint), h in sorted(histograms.items()):
+                    histogram(name, h, method=method, endpoint=endpoint)
+            name = f"{prefix}_token_refresh_seconds"
+            lines.append(f"# TYPE {name} histogram")
+            histogram(name, self.token_refresh)
+            typed: set[str] = set()
+            for (metric, label_items), value in sorted(self.counters.items()):
+                name = f"{prefix}_{metric}"
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{labels(**dict(label_items))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def response_size(response: requests.Response, streamed: bool) -> int | None:
+    if streamed:
+        length = response.headers.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
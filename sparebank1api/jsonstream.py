@@ -0,0 +1,141 @@
+"""Incremental decoding of JSON list responses.
+
+The transaction endpoints answer ``{"transactions": [...]}``. iter_json_items
+yields the array's elements one at a time while the body is still arriving,
+so memory is bounded by one element plus one chunk instead of the whole
+response. ijson (with its C backend) is used when installed; otherwise
+elements are decoded with the standard library's C scanner.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Text after a decoded number that may be the start of more of it, e.g. "2."
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+class _Buffer:
+    """Decoded text from byte chunks, read forward and trimmed as it is consumed."""
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, returning False at the end of the body."""
+        if self.eof:
+            return False
+        if self.pos > 65536:
+            self.text = self.text[self.pos :]
+            self.pos = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            self.text += self._decoder.decode(b"", final=True)
+        else:
+            self.text += self._decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if not found:
+            raise ValueError("Unexpected end of JSON body.")
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of JSON body.")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value, reading more while it is cut off."""
+        _ = self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number at the end of the text may continue in the next chunk
+            if not self.eof and (
+                end == len(self.text)
+                or (
+                    type(value) in (int, float)
+                    and _NUMBER_TAIL.match(self.text, end) is not None
+                )
+            ):
+                _ = self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_stdlib(
+    chunks: Iterable[bytes], key: str, encoding: str
+) -> Iterator[dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks, encoding)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.value(decoder)
+        buffer.expect(":")
+        if name == key:
+            break
+        _ = buffer.value(decoder)
+        if buffer.peek() == "}":
+            return
+        buffer.expect(",")
+
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        return
+    while True:
+        yield buffer.value(decoder)
+        if buffer.peek() == "]":
+            return
+        buffer.expect(",")
+
+
+def _iter_ijson(chunks: Iterable[bytes], key: str) -> Iterator[dict[str, Any]]:
+    assert ijson is not None
+    items: list[Any] = ijson.sendable_list()
+    parser = ijson.items_coro(items, f"{key}.item", use_float=True)
+    for chunk in chunks:
+        parser.send(chunk)
+        yield from items
+        del items[:]
+    parser.close()
+    yield from items
+
+
+def iter_json_items(
+    chunks: Iterable[bytes], key: str = "transactions", encoding: str = "utf-8"
+) -> Iterator[dict[str, Any]]:
+    """Yield the elements of the array under key in a JSON object body.
+
+    Yields nothing when the object has no such key. Numbers decode as float
+    and int, as with response.json().
+    """
+    if ijson is not None and encoding.replace("-", "").lower() == "utf8":
+        return _iter_ijson(chunks, key)
+    return _iter_stdlib(chunks, key, encoding)
@@ -0,0 +1,183 @@
+"""Typed, compact models for API payloads.
+
+These are opt-in: the API classes keep returning plain dicts, and the
+``*_models``/``*_batch`` methods or the ``from_dict`` constructors here
+convert them. Amounts are Decimal and dates are parsed.
+"""
+
+import json
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Iterator
+
+from .transactions import BANK_TIMEZONE
+
+try:
+    import orjson
+
+    loads: Callable[[bytes | str], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+# Minor units per currency unit for integer amounts (e.g. øre per krone)
+SCALE = 100
+
+
+def to_decimal(value: Any) -> Decimal | None:
+    """Convert a JSON number to Decimal via its shortest repr, e.g. 0.1 -> 0.1."""
+    if value is None:
+        return None
+    return Decimal(str(value))
+
+
+def to_minor_units(value: Any) -> int:
+    """Convert an amount to integer minor units via to_decimal; None is 0."""
+    amount = to_decimal(value) or Decimal(0)
+    return int((amount * SCALE).to_integral_value())
+
+
+def to_date(value: Any) -> date | None:
+    """Parse epoch milliseconds (as a date in BANK_TIMEZONE) or an ISO date string."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, BANK_TIMEZONE).date()
+    return date.fromisoformat(value[:10])
+
+
+@dataclass(slots=True, frozen=True)
+class Account:
+    key: str
+    account_number: str | None
+    name: str | None
+    balance: Decimal | None
+    available_balance: Decimal | None
+    currency_code: str | None
+    type: str | None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Account":
+        return cls(
+            key=data["key"],
+            account_number=data.get("accountNumber"),
+            name=data.get("name"),
+            balance=to_decimal(data.get("balance")),
+            available_balance=to_decimal(data.get("availableBalance")),
+            currency_code=data.get("currencyCode"),
+            type=data.get("type"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Balance:
+    account_number: str | None
+    available_balance: Decimal | None
+    booked_balance: Decimal | None
+    currency_code: str | None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Balance":
+        return cls(
+            account_number=data.get("accountNumber"),
+            available_balance=to_decimal(data.get("availableBalance")),
+            booked_balance=to_decimal(data.get("bookedBalance")),
+            currency_code=data.get("currencyCode"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Transaction:
+    id: str | None
+    account_key: str | None
+    date: date | None
+    amount: Decimal | None
+    currency_code: str | None
+    description: str | None
+    booking_status: str | None
+    type_code: str | None
+    source: str | None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Transaction":
+        return cls(
+            id=data.get("id"),
+            account_key=data.get("accountKey"),
+            date=to_date(data.get("date")),
+            amount=to_decimal(data.get("amount")),
+            currency_code=data.get("currencyCode"),
+            description=data.get("cleanedDescription") or data.get("description"),
+            booking_status=data.get("bookingStatus"),
+            type_code=data.get("typeCode"),
+            source=data.get("source"),
+        )
+
+
+def iter_transaction_models(
+    transactions: Iterable[dict[str, Any]],
+) -> Iterator[Transaction]:
+    """Lazily convert transaction dicts to Transaction models."""
+    return map(Transaction.from_dict, transactions)
+
+
+class TransactionBatch:
+    """Columnar transactions for analytics.
+
+    Dates are epoch milliseconds and amounts are integer minor units (e.g.
+    øre), both in compact arrays. Account keys are stored once in
+    account_keys and referenced by index from account_index.
+    """
+
+    __slots__ = ("ids", "dates", "amounts", "account_index", "account_keys", "_keys")
+
+    SCALE = SCALE
+
+    ids: list[str | None]
+    dates: array
+    amounts: array
+    account_index: array
+    account_keys: list[str | None]
+    _keys: dict[str | None, int]
+
+    def __init__(self):
+        self.ids = []
+        self.dates = array("q")
+        self.amounts = array("q")
+        self.account_index = array("L")
+        self.account_keys = []
+        self._keys = {}
+
+    @classmethod
+    def from_dicts(cls, transactions: Iterable[dict[str, Any]]) -> "TransactionBatch":
+        batch = cls()
+        batch.extend(transactions)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, transaction: dict[str, Any]):
+        key = transaction.get("accountKey")
+        index = self._keys.get(key)
+        if index is None:
+            index = self._keys[key] = len(self.account_keys)
+            self.account_keys.append(key)
+        self.ids.append(transaction.get("id"))
+        self.dates.append(int(transaction.get("date") or 0))
+        self.amounts.append(to_minor_units(transaction.get("amount")))
+        self.account_index.append(index)
+
+    def extend(self, transactions: Iterable[dict[str, Any]]):
+        for transaction in transactions:
+            self.append(transaction)
+
+    def amount_at(self, i: int) -> Decimal:
+        return Decimal(self.amounts[i]) / self.SCALE
+
+    def date_at(self, i: int) -> date:
+        return datetime.fromtimestamp(self.dates[i] / 1000, BANK_TIMEZONE).date()
+
+    def account_key_at(self, i: int) -> str | None:
+        return self.account_keys[self.account_index[i]]
@@ -0,0 +1,258 @@
+import asyncio
+import heapq
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Callable
+
+from .concurrency import map_concurrent
+from .models import to_decimal
+from .scheduler import TokenBucket
+
+if TYPE_CHECKING:
+    from .api import SpareBank1API
+
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent:
+    """A detected change on a watched account.
+
+    kind is "balance", "new_transaction" or "updated_transaction"; current
+    and previous are the balance or transaction payloads.
+    """
+
+    kind: str
+    account_key: str
+    current: dict[str, Any]
+    previous: dict[str, Any] | None = None
+
+    @property
+    def delta(self) -> Decimal | None:
+        """Change in available balance for balance events."""
+        if self.kind != "balance" or self.previous is None:
+            return None
+        current = to_decimal(self.current.get("availableBalance"))
+        previous = to_decimal(self.previous.get("availableBalance"))
+        if current is None or previous is None:
+            return None
+        return current - previous
+
+
+@dataclass(slots=True)
+class _Watched:
+    key: str
+    number: str
+    interval: float
+    seq: int = 0
+    balance: dict[str, Any] | None = None
+    transactions: dict[str, dict[str, Any]] | None = None
+    polls: int = 0
+    changes: int = 0
+    last_error: Exception | None = field(default=None, repr=False)
+
+
+def _balance_changed(previous: dict[str, Any], current: dict[str, Any]) -> bool:
+    return any(
+        previous.get(k) != current.get(k) for k in ("availableBalance", "bookedBalance")
+    )
+
+
+def _transaction_changed(previous: dict[str, Any], current: dict[str, Any]) -> bool:
+    return any(
+        previous.get(k) != current.get(k) for k in ("bookingStatus", "amount", "date")
+    )
+
+
+class ChangePoller:
+    """Polls many accounts for balance and transaction changes.
+
+    Each poll costs one balance request; recent transactions are only listed
+    when the balance moved, and diffed against the ones seen before. Accounts
+    that change are polled every min_interval seconds, idle ones back off by
+    backoff up to max_interval. All requests share a requests_per_minute
+    budget; when it is too small for the schedule, the most overdue accounts
+    go first. The first poll of an account records its state without events.
+
+    Events go to subscribed callbacks, called on the polling thread. Use
+    subscribe_queue to receive them on an asyncio.Queue instead.
+    """
+
+    def __init__(
+        self,
+        api: "SpareBank1API",
+        accounts: dict[str, str],
+        requests_per_minute: float = 60,
+        min_interval: float = 30,
+        max_interval: float = 3600,
+        backoff: float = 2.0,
+        lookback_days: int = 3,
+        max_concurrency: int = 8,
+    ):
+        """accounts maps account keys to account numbers."""
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.lookback_days = lookback_days
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(requests_per_minute / 60, max_concurrency)
+        # About a minute of budget per round, so stop() stays responsive
+        self.batch_size = max(max_concurrency, int(requests_per_minute))
+        self.stats = {"polls": 0, "requests": 0, "events": 0, "errors": 0}
+        self._accounts: dict[str, _Watched] = {}
+        self._due: list[tuple[float, int, str]] = []
+        self._seq = 0
+        self._callbacks: list[Callable[[ChangeEvent], Any]] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        for key, number in accounts.items():
+            self.watch(key, number)
+
+    def watch(self, account_key: str, account_number: str):
+        with self._lock:
+            if account_key in self._accounts:
+                return
+            watched = self._accounts[account_key] = _Watched(
+                account_key, account_number, self.min_interval
+            )
+            self._schedule(watched, monotonic())
+
+    def unwatch(self, account_key: str):
+        with self._lock:
+            _ = self._accounts.pop(account_key, None)
+
+    def subscribe(self, callback: Callable[[ChangeEvent], Any]):
+        self._callbacks.append(callback)
+
+    def subscribe_queue(
+        self,
+        queue: "asyncio.Queue[ChangeEvent]",
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        """Deliver events to queue on loop (default: the running loop)."""
+        loop = loop or asyncio.get_running_loop()
+        self.subscribe(lambda event: loop.call_soon_threadsafe(queue.put_nowait, event))
+
+    def _schedule(self, watched: _Watched, due: float):
+        # Only the entry matching watched.seq is live; older ones, e.g. from
+        # before an unwatch() and watch(), are skipped when popped
+        self._seq += 1
+        watched.seq = self._seq
+        heapq.heappush(self._due, (due, self._seq, watched.key))
+
+    def next_due(self) -> float | None:
+        """monotonic() time when the next account is due, if any."""
+        with self._lock:
+            return self._due[0][0] if self._due else None
+
+    def _request(self, call: Callable[[], Any]) -> Any:
+        sleep(self.bucket.reserve())
+        with self._lock:
+            self.stats["requests"] += 1
+        return call()
+
+    def _poll(self, watched: _Watched) -> list[ChangeEvent]:
+        balance = self._request(
+            lambda: self.api.accounts.get_account_balance(watched.number)
+        )
+        # The new state is only kept once the transactions are listed too, so
+        # a failed listing is retried by the next poll instead of lost
+        previous = watched.balance
+        if previous is None:
+            watched.transactions = self._list_transactions(watched)
+            watched.balance = balance
+            return []
+        if not _balance_changed(previous, balance):
+            return []
+
+        events = [ChangeEvent("balance", watched.key, balance, previous)]
+        seen = watched.transactions or {}
+        current = self._list_transactions(watched)
+        watched.balance = balance
+        watched.transactions = current
+        for transaction_id, transaction in current.items():
+            before = seen.get(transaction_id)
+            if before is None:
+                events.append(ChangeEvent("new_transaction", watched.key, transaction))
+            elif _transaction_changed(before, transaction):
+                events.append(
+                    ChangeEvent("updated_transaction", watched.key, transaction, before)
+                )
+        return events
+
+    def _list_transactions(self, watched: _Watched) -> dict[str, dict[str, Any]]:
+        payload = self._request(
+            lambda: self.api.transactions.list_transactions(
+                [watched.key],
+                from_date=date.today() - timedelta(days=self.lookback_days),
+            )
+        )
+        return {t["id"]: t for t in payload.get("transactions", []) if t.get("id")}
+
+    def poll_due(self) -> list[ChangeEvent]:
+        """Poll the accounts that are due now and emit the resulting events."""
+        now = monotonic()
+        due: dict[str, _Watched] = {}
+        with self._lock:
+            while self._due and self._due[0][0] <= now and len(due) < self.batch_size:
+                _, seq, key = heapq.heappop(self._due)
+                watched = self._accounts.get(key)
+                if watched is not None and watched.seq == seq:
+                    due[key] = watched
+
+        results, errors = map_concurrent(
+            lambda key: self._poll(due[key]), due, self.max_concurrency
+        )
+        events: list[ChangeEvent] = []
+        with self._lock:
+            for watched in due.values():
+                watched.polls += 1
+                changed = bool(results.get(watched.key))
+                watched.last_error = errors.get(watched.key)
+                if changed:
+                    watched.changes += 1
+                    watched.interval = self.min_interval
+                else:
+                    watched.interval = min(
+                        self.max_interval, watched.interval * self.backoff
+                    )
+                if self._accounts.get(watched.key) is watched:
+                    self._schedule(watched, monotonic() + watched.interval)
+                events.extend(results.get(watched.key, []))
+            self.stats["polls"] += len(due)
+            self.stats["errors"] += len(errors)
+            self.stats["events"] += len(events)
+
+        for event in events:
+            for callback in self._callbacks:
+                callback(event)
+        return events
+
+    def run(self, stop: threading.Event | None = None):
+        """Poll until stop is set."""
+        stop = stop or self._stop
+        while not stop.is_set():
+            _ = self.poll_due()
+            due = self.next_due()
+            _ = stop.wait(
+                self.min_interval if due is None else max(0.0, due - monotonic())
+            )
+
+    def start(self):
+        """Poll in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="sparebank1api-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
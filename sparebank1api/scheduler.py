@@ -0,0 +1,147 @@
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep, time
+from typing import Callable
+
+import requests
+
+from .timeouts import remaining
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing rate requests/second with bursts."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for seconds, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+
+
+class RequestScheduler:
+    """Rate limits requests and retries throttled or failed idempotent ones.
+
+    Requests pass through a token bucket when rate is set. Responses with a
+    status in RETRY_STATUSES and connection errors are retried with
+    exponential backoff and full jitter, or after Retry-After when the server
+    sends one, but only for idempotent requests. A 429 pauses the bucket for
+    all callers. No retry is attempted if its delay would overrun the current
+    timeouts.deadline.
+    """
+
+    bucket: TokenBucket | None
+    stats: dict[str, float]
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "delay_seconds": 0}
+        self._stats_lock = threading.Lock()
+
+    def record(self, stat: str, value: float = 1):
+        with self._stats_lock:
+            self.stats[stat] += value
+
+    def _wait(self, seconds: float):
+        if seconds > 0:
+            self.record("delay_seconds", seconds)
+            sleep(seconds)
+
+    @staticmethod
+    def _past_deadline(delay: float) -> bool:
+        """Whether waiting delay before a retry would overrun the current deadline."""
+        left = remaining()
+        return left is not None and delay >= left
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def send(
+        self,
+        send: Callable[[], requests.Response],
+        idempotent: bool,
+        on_retry: Callable[[], None] | None = None,
+    ) -> requests.Response:
+        attempt = 0
+        while True:
+            if self.bucket:
+                self._wait(self.bucket.reserve())
+            self.record("requests")
+            try:
+                response = send()
+            except requests.ConnectionError:
+                delay = self.backoff(attempt)
+                if (
+                    not idempotent
+                    or attempt >= self.max_retries
+                    or self._past_deadline(delay)
+                ):
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    self.record("throttled")
+                    if self.bucket and retry_after:
+                        self.bucket.pause(retry_after)
+                delay = (
+                    retry_after if retry_after is not None else self.backoff(attempt)
+                )
+                if (
+                    not idempotent
+                    or attempt >= self.max_retries
+                    or self._past_deadline(delay)
+                ):
+                    return response
+                response.close()
+            self.record("retries")
+            if on_retry is not None:
+                on_retry()
+            self._wait(delay)
+            attempt += 1
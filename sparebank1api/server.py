@@ -1,5 +1,15 @@
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import Any
+import secrets
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http.server import HTTPServer, BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlparse
+
+if TYPE_CHECKING:
+    from .api import SpareBank1API
+    from .client import BaseAPI, Token
 
 
 def callbackhandler_factory(res: dict[Any, Any]):
@@ -15,9 +25,155 @@ def callbackhandler_factory(res: dict[Any, Any]):
     return CallbackHandler
 
 
-def wait_for_callback(port: int = 8080):
+def wait_for_callback(port: int = 8080, timeout: float | None = None):
     server_address = ("", port)
     res: dict[str, Any] = {}
     httpd = HTTPServer(server_address, callbackhandler_factory(res))
+    httpd.timeout = timeout
     httpd.handle_request()
+    httpd.server_close()
+    if "path" not in res:
+        raise TimeoutError("No authorization callback received.")
     return res
+
+
+@dataclass
+class PendingAuthorization:
+    """An authorization flow waiting for its redirect.
+
+    done resolves to the token once the code has been exchanged, or fails
+    with the authorization error, or TimeoutError when the state expires.
+    """
+
+    url: str
+    state: str
+    api: "BaseAPI"
+    expires_at: float
+    done: "Future[Token]" = field(default_factory=Future)
+
+
+class CallbackServer:
+    """Long-running OAuth redirect endpoint for many concurrent flows.
+
+    begin() starts a flow for a client (e.g. a TenantRegistry view) and
+    returns its authorization URL. Redirects are routed by state to the
+    client that created it, which exchanges the code and saves the token to
+    its token store. Redirects are handled on their own threads, with at most
+    max_exchanges token requests at once; states not completed within
+    state_ttl seconds expire.
+    """
+
+    def __init__(
+        self,
+        port: int = 8080,
+        host: str = "",
+        state_ttl: float = 600,
+        max_exchanges: int = 8,
+    ):
+        self.state_ttl = state_ttl
+        self._pending: dict[str, PendingAuthorization] = {}
+        self._lock = threading.Lock()
+        self._exchanges = threading.BoundedSemaphore(max_exchanges)
+        self._thread: threading.Thread | None = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any):
+                pass
+
+            def do_GET(self):
+                status, message = server.handle_redirect(self.path)
+                body = message.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                _ = self.wfile.write(body)
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128
+
+            def service_actions(self):
+                server.expire()
+
+        self.httpd = Server((host, port), Handler)
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_port
+
+    def begin(self, api: "BaseAPI | SpareBank1API") -> PendingAuthorization:
+        """Start an authorization flow for api and register its state."""
+        base: "BaseAPI" = getattr(api, "_base", api)
+        state = secrets.token_urlsafe(16)
+        pending = PendingAuthorization(
+            base.get_authorization_url(state),
+            state,
+            base,
+            monotonic() + self.state_ttl,
+        )
+        with self._lock:
+            self._pending[pending.state] = pending
+        return pending
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def expire(self):
+        """Fail and forget flows whose state has outlived state_ttl."""
+        now = monotonic()
+        with self._lock:
+            expired = [p for p in self._pending.values() if p.expires_at <= now]
+            for pending in expired:
+                del self._pending[pending.state]
+        for pending in expired:
+            pending.done.set_exception(TimeoutError("Authorization state expired."))
+
+    def handle_redirect(self, path: str) -> tuple[int, str]:
+        query = parse_qs(urlparse(path).query)
+        state = query.get("state", [None])[0]
+        with self._lock:
+            pending = self._pending.pop(state, None) if state else None
+        if pending is None or pending.expires_at <= monotonic():
+            if pending is not None:
+                pending.done.set_exception(TimeoutError("Authorization state expired."))
+            return 400, "Unknown or expired authorization request."
+
+        error = query.get("error", [None])[0]
+        if error:
+            pending.done.set_exception(ValueError(f"Authorization failed: {error}"))
+            return 400, f"Authorization failed: {error}"
+        try:
+            with self._exchanges:
+                pending.api.fetch_token(path, expected_state=pending.state)
+        except Exception as e:
+            pending.done.set_exception(e)
+            return 502, "Could not complete authorization."
+        assert pending.api.token
+        pending.done.set_result(pending.api.token)
+        return 200, "Authorization complete. You can close this window."
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            name="sparebank1api-callback-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info: Any):
+        self.stop()
@@ -0,0 +1,237 @@
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from .transactions import booking_date
+
+if TYPE_CHECKING:
+    from .transactions import TransactionsAPI
+
+
+class TransactionStore:
+    """Local SQLite copy of transactions, kept current with delta syncs.
+
+    Rows are keyed by account key and transaction id. Each sync only fetches
+    from the newest stored booking date minus overlap_days, so pending
+    transactions that were booked (or changed) since the last run are
+    updated in place.
+    """
+
+    def __init__(self, path: str = "transactions.sqlite"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            _ = self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    account_key TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    booking_date TEXT,
+                    booking_status TEXT,
+                    amount TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (account_key, id)
+                );
+                CREATE INDEX IF NOT EXISTS transactions_by_date
+                    ON transactions (account_key, booking_date);
+                """)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    def upsert(self, account_key: str, transactions: list[dict[str, Any]]) -> int:
+        """Insert or update transactions, returning the number of rows changed."""
+        rows = []
+        for transaction in transactions:
+            if transaction.get("id") is None:
+                continue
+            day = booking_date(transaction)
+            rows.append(
+                (
+                    account_key,
+                    transaction["id"],
+                    day.isoformat() if day else None,
+                    transaction.get("bookingStatus"),
+                    str(transaction.get("amount")),
+                    json.dumps(transaction, sort_keys=True),
+                )
+            )
+        with self._lock, self._db:
+            before = self._db.total_changes
+            _ = self._db.executemany(
+                "INSERT INTO transactions"
+                " (account_key, id, booking_date, booking_status, amount, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (account_key, id) DO UPDATE SET"
+                " booking_date = excluded.booking_date,"
+                " booking_status = excluded.booking_status,"
+                " amount = excluded.amount,"
+                " data = excluded.data"
+                " WHERE data != excluded.data",
+                rows,
+            )
+            return self._db.total_changes - before
+
+    def last_booking_date(self, account_key: str) -> date | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT max(booking_date) FROM transactions WHERE account_key = ?",
+                (account_key,),
+            ).fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def sync(
+        self,
+        transactions_api: TransactionsAPI,
+        account_keys: list[str],
+        initial_from_date: date,
+        overlap_days: int = 7,
+        **kwargs: Any,
+    ) -> dict[str, int]:
+        """Fetch new and changed transactions for each account.
+
+        Accounts without stored rows are fetched from initial_from_date.
+        Stored pending transactions that are no longer returned (for example
+        because the bank booked them under a new id) are removed. Keyword
+        arguments are passed on to TransactionsAPI.iter_transactions.
+        Returns the number of rows changed per account.
+        """
+        changed: dict[str, int] = {}
+        for account_key in account_keys:
+            last = self.last_booking_date(account_key)
+            from_date = (
+                last - timedelta(days=overlap_days) if last else initial_from_date
+            )
+            stale_pending = self._pending_ids(account_key, from_date)
+            batch: list[dict[str, Any]] = []
+            changed[account_key] = 0
+            for transaction in transactions_api.iter_transactions(
+                [account_key], from_date=from_date, **kwargs
+            ):
+                stale_pending.discard(transaction.get("id"))
+                batch.append(transaction)
+                if len(batch) >= 500:
+                    changed[account_key] += self.upsert(account_key, batch)
+                    batch = []
+            changed[account_key] += self.upsert(account_key, batch)
+            changed[account_key] += self._delete(account_key, stale_pending)
+        return changed
+
+    def _pending_ids(self, account_key: str, from_date: date) -> set[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM transactions WHERE account_key = ?"
+                " AND booking_status = 'PENDING'"
+                " AND (booking_date IS NULL OR booking_date >= ?)",
+                (account_key, from_date.isoformat()),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _delete(self, account_key: str, ids: set[str]) -> int:
+        if not ids:
+            return 0
+        with self._lock, self._db:
+            return self._db.executemany(
+                "DELETE FROM transactions WHERE account_key = ? AND id = ?",
+                [(account_key, i) for i in ids],
+            ).rowcount
+
+    def query(
+        self,
+        account_keys: list[str] | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        booking_status: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield stored transactions, oldest first."""
+        clauses: list[str] = []
+        args: list[Any] = []
+        if account_keys:
+            clauses.append(f"account_key IN ({', '.join('?' * len(account_keys))})")
+            args.extend(account_keys)
+        if from_date:
+            clauses.append("booking_date >= ?")
+            args.append(from_date.isoformat())
+        if to_date:
+            clauses.append("booking_date <= ?")
+            args.append(to_date.isoformat())
+        if booking_status:
+            clauses.append("booking_status = ?")
+            args.append(booking_status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT data FROM transactions{where} ORDER BY booking_date, id",
+                args,
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                return
+            for (data,) in rows:
+                yield json.loads(data)
+
+
+def is_booked(details: dict[str, Any]) -> bool:
+    """Whether details are final; without a bookingStatus they may still change."""
+    return details.get("bookingStatus") == "BOOKED"
+
+
+class TransactionDetailsCache:
+    """Persistent SQLite cache of transaction details.
+
+    Only details accepted by cacheable (booked transactions by default) are
+    stored; they never change, so entries do not expire.
+    """
+
+    def __init__(
+        self,
+        path: str = "transaction_details.sqlite",
+        cacheable: Callable[[dict[str, Any]], bool] = is_booked,
+    ):
+        self.cacheable = cacheable
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            _ = self._db.execute(
+                "CREATE TABLE IF NOT EXISTS details ("
+                " kind TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL,"
+                " PRIMARY KEY (kind, id))"
+            )
+
+    def close(self):
+        self._db.close()
+
+    def get_many(self, kind: str, ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        unique = list(dict.fromkeys(ids))
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                rows = self._db.execute(
+                    f"SELECT id, data FROM details WHERE kind = ?"
+                    f" AND id IN ({', '.join('?' * len(chunk))})",
+                    [kind, *chunk],
+                ).fetchall()
+                found.update((i, json.loads(data)) for i, data in rows)
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(unique) - len(found)
+        return found
+
+    def put_many(self, kind: str, details: dict[str, dict[str, Any]]):
+        rows = [
+            (kind, i, json.dumps(d)) for i, d in details.items() if self.cacheable(d)
+        ]
+        with self._lock, self._db:
+            _ = self._db.executemany(
+                "INSERT OR REPLACE INTO details (kind, id, data) VALUES (?, ?, ?)", rows
+            )
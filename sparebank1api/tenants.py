@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import requests
+
+from .api import SpareBank1API
+from .cache import ResponseCache
+from .client import BaseAPI, Token
+from .config import Config
+from .instrumentation import Instrumentation
+from .scheduler import RequestScheduler
+from .tokenstore import DEFAULT_TOKEN_KEY, TokenStore, create_token_store
+
+
+class TenantRegistry:
+    """Clients for many end users sharing one connection pool.
+
+    Each user gets a SpareBank1API view with its own token, loaded from the
+    token store on first use and refreshed lazily by requests. The views
+    share the session, the rate limiter, the cache (partitioned by user) and
+    the instrumentation. At most max_active views are kept; the least
+    recently used ones are dropped and rebuilt from the store when needed, so
+    memory scales with active users and socket count with the pool size.
+    """
+
+    config: Config
+    session: requests.Session
+    scheduler: RequestScheduler
+    cache: ResponseCache | None
+    instrumentation: Instrumentation | None
+    token_store: TokenStore
+    _views: OrderedDict[str, SpareBank1API]
+
+    def __init__(
+        self,
+        config: Config,
+        cache: ResponseCache | None = None,
+        instrumentation: Instrumentation | None = None,
+        token_store: TokenStore | None = None,
+        scheduler: RequestScheduler | None = None,
+        max_active: int = 256,
+    ):
+        self.config = config
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self.token_store = (
+            token_store if token_store is not None else create_token_store(config)
+        )
+        self.scheduler = (
+            scheduler
+            if scheduler is not None
+            else RequestScheduler(
+                rate=config.rate_limit,
+                burst=config.rate_burst,
+                max_retries=config.max_retries,
+            )
+        )
+        self.session = BaseAPI.create_session(config)
+        self.max_active = max_active
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def token_key(user_id: str) -> str:
+        return f"{DEFAULT_TOKEN_KEY}-{user_id}"
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def get(self, user_id: str) -> SpareBank1API:
+        """The client view for user_id, creating it if it is not active."""
+        with self._lock:
+            view = self._views.get(user_id)
+            if view is not None:
+                self._views.move_to_end(user_id)
+                return view
+            view = self._views[user_id] = self._create(user_id)
+            evicted = []
+            while len(self._views) > self.max_active:
+                evicted.append(self._views.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+        return view
+
+    __getitem__ = get
+
+    def _create(self, user_id: str) -> SpareBank1API:
+        base = BaseAPI(
+            self.config,
+            session=self.session,
+            cache=self.cache,
+            scheduler=self.scheduler,
+            instrumentation=self.instrumentation,
+            token_store=self.token_store,
+            token_key=self.token_key(user_id),
+        )
+        base.cache_namespace = f"{self.config.client_id or ''}/{user_id}"
+        base.token = self.token_store.load(base.token_key)
+        return SpareBank1API(self.config, base=base)
+
+    def register(self, user_id: str, token: Token):
+        """Store a token obtained elsewhere for user_id."""
+        self.token_store.save(self.token_key(user_id), token)
+        with self._lock:
+            view = self._views.get(user_id)
+        if view is not None:
+            view._base.token = token
+
+    def release(self, user_id: str):
+        """Drop the active view for user_id; its token stays in the store."""
+        with self._lock:
+            view = self._views.pop(user_id, None)
+        if view is not None:
+            view.close()
+
+    def close(self):
+        with self._lock:
+            views = list(self._views.values())
+            self._views.clear()
+        for view in views:
+            view.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
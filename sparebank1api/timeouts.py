@@ -0,0 +1,139 @@
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+from time import monotonic
+from typing import Iterator
+
+Timeout = tuple[float, float]
+
+# Endpoint labels (see instrumentation.endpoint_label) -> (connect, read)
+# seconds. Endpoints without a match use the configured defaults.
+DEFAULT_TIMEOUTS: dict[str, Timeout] = {
+    "transactions/export": (5.0, 300.0),
+}
+
+DEFAULT_HEDGED_ENDPOINTS = (
+    "accounts",
+    "accounts/{id}",
+    "accounts/{id}/details",
+    "transactions",
+    "transactions/classified",
+)
+
+_deadline: ContextVar[float | None] = ContextVar("sparebank1api_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Make all requests in the block finish within seconds.
+
+    The deadline is a context variable, so it follows the call into the
+    worker threads of batch operations (map_concurrent, iter_transactions,
+    the async client). Nested deadlines never extend an outer one.
+    """
+    at = monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(outer, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left until the current deadline, or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - monotonic()
+
+
+def bounded_timeout(timeout: Timeout) -> Timeout:
+    """Shorten timeout to the current deadline, raising if it has passed."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded.")
+    return min(timeout[0], left), min(timeout[1], left)
+
+
+def timeout_for(
+    endpoint: str, timeouts: dict[str, Timeout], default: Timeout
+) -> Timeout:
+    for pattern, timeout in timeouts.items():
+        if fnmatchcase(endpoint, pattern):
+            return timeout
+    return default
+
+
+class HedgePolicy:
+    """When to send a backup copy of a slow idempotent GET.
+
+    A hedge fires once the first request has been outstanding longer than
+    the given latency percentile of the endpoint's last window responses
+    (never below min_delay, and not before min_samples responses were seen).
+    The percentile is taken from the raw samples, so it tracks changes in
+    latency and is exact rather than rounded to histogram buckets. Hedges are
+    capped at budget times the number of hedgeable requests, so they add at
+    most that fraction of extra load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        endpoints: tuple[str, ...] = DEFAULT_HEDGED_ENDPOINTS,
+        window: int = 500,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.endpoints = endpoints
+        self.window = window
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        self._latency: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def applies(self, endpoint: str) -> bool:
+        return any(fnmatchcase(endpoint, p) for p in self.endpoints)
+
+    def observe(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._latency.get(endpoint)
+            if samples is None:
+                samples = self._latency[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def delay(self, endpoint: str) -> float | None:
+        """Seconds to wait before hedging, or None while there is too little data."""
+        with self._lock:
+            self.stats["requests"] += 1
+            samples = self._latency.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        # Nearest rank: the smallest sample with at least percentile% at or below it
+        rank = math.ceil(self.percentile / 100 * len(ordered))
+        threshold = ordered[min(len(ordered), max(rank, 1)) - 1]
+        return max(self.min_delay, threshold)
+
+    def acquire(self) -> bool:
+        """Take a hedge from the budget, if there is one left."""
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.budget * self.stats["requests"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def record_win(self):
+        with self._lock:
+            self.stats["hedge_wins"] += 1
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+from .config import Config
+
+if TYPE_CHECKING:
+    from .client import Token
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_TOKEN_KEY = "token"
+
+
+class TokenStore(ABC):
+    """Base class for token persistence used by BaseAPI.
+
+    Tokens are stored under a key, one per client/user. locked(key) holds an
+    exclusive lock while BaseAPI reloads and refreshes a token, so clients
+    sharing a store refresh once per expiry instead of once each. Subclasses
+    implement load and save; the default locked does not lock.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> "Token | None": ...
+
+    @abstractmethod
+    def save(self, key: str, token: "Token"): ...
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[None]:
+        yield
+
+
+class MemoryTokenStore(TokenStore):
+    """Tokens shared between clients in one process."""
+
+    def __init__(self):
+        self._tokens: dict[str, "Token"] = {}
+        self._locks: dict[str, threading.RLock] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> "Token | None":
+        with self._lock:
+            token = self._tokens.get(key)
+            return None if token is None else token.copy()
+
+    def save(self, key: str, token: "Token"):
+        with self._lock:
+            self._tokens[key] = token.copy()
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[None]:
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.RLock())
+        with lock:
+            yield
+
+
+class FileTokenStore(TokenStore):
+    """One JSON file per key in directory, e.g. ``./token.json`` for the default key.
+
+    Writes go to a temporary file that is renamed into place, so readers
+    never see a partial token. locked() takes an advisory lock (fcntl.flock)
+    on a ``.lock`` file next to it, which serializes refreshes across
+    processes on the same host; without fcntl only threads are serialized.
+    """
+
+    def __init__(self, directory: str = "."):
+        self.directory = directory
+        self._lock = threading.RLock()
+
+    def path(self, key: str) -> str:
+        name = re.sub(r"[^\w.-]", "_", key)
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, key: str) -> "Token | None":
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, token: "Token"):
+        path = self.path(key)
+        fd, tmp = tempfile.mkstemp(
+            dir=self.directory or ".", prefix=os.path.basename(path), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                _ = f.write(json.dumps(token))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path(key)}.lock", "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SQLiteTokenStore(TokenStore):
+    """Tokens in a SQLite database, shared by all processes that open it.
+
+    locked() holds a write transaction (BEGIN IMMEDIATE) on the database, so
+    it serializes refreshes for all keys, not just the one given.
+    """
+
+    def __init__(self, path: str = "tokens.sqlite", timeout: float = 30):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        with self._db() as db:
+            _ = db.execute(
+                "CREATE TABLE IF NOT EXISTS tokens"
+                " (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        db: sqlite3.Connection | None = getattr(self._local, "db", None)
+        if db is not None:
+            yield db
+            return
+        db = self._connect()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def load(self, key: str) -> "Token | None":
+        with self._db() as db:
+            row = db.execute("SELECT data FROM tokens WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save(self, key: str, token: "Token"):
+        with self._db() as db:
+            _ = db.execute(
+                "INSERT OR REPLACE INTO tokens (key, data) VALUES (?, ?)",
+                (key, json.dumps(token)),
+            )
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[None]:
+        with self._lock:
+            if getattr(self._local, "db", None) is not None:
+                yield
+                return
+            db = self._connect()
+            _ = db.execute("BEGIN IMMEDIATE")
+            self._local.db = db
+            try:
+                yield
+                _ = db.execute("COMMIT")
+            except BaseException:
+                _ = db.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.db = None
+                db.close()
+
+
+def create_token_store(config: Config) -> TokenStore:
+    """Create the token store selected by config.token_store and config.token_path."""
+    kind = config.token_store.lower()
+    path = config.token_path
+    if kind == "file":
+        return FileTokenStore(path or ".")
+    if kind == "sqlite":
+        return SQLiteTokenStore(path or "tokens.sqlite")
+    if kind == "memory":
+        return MemoryTokenStore()
+    raise ValueError(f"Unknown token store: {kind}")
@@ -1,9 +1,73 @@
-from datetime import date
-from typing import TYPE_CHECKING, Any, Literal
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime, timedelta
+import heapq
+from time import sleep
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator, Literal
+import warnings
+from zoneinfo import ZoneInfo
+
 from .apierror import APIError
 
 if TYPE_CHECKING:
     from .client import BaseAPI
+    from .models import Transaction, TransactionBatch
+    from .store import TransactionDetailsCache
+
+# Transaction dates are sent as epoch milliseconds at midnight Norwegian time
+BANK_TIMEZONE = ZoneInfo("Europe/Oslo")
+
+
+def transaction_sort_key(transaction: dict[str, Any]) -> tuple[int, str]:
+    """Sort key ordering transactions by date (epoch milliseconds), then id."""
+    return (transaction.get("date") or 0, transaction.get("id") or "")
+
+
+def booking_date(transaction: dict[str, Any]) -> date | None:
+    """The transaction date in BANK_TIMEZONE, independent of the local zone."""
+    value = transaction.get("date")
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1000, BANK_TIMEZONE).date()
+
+
+def transaction_params(
+    account_keys: list[str] | str,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    row_limit: int | None = None,
+    transaction_source: list[Literal["RECENT", "HISTORIC", "ALL"]] | None = None,
+    enrich_with_payment_details: bool | None = None,
+) -> list[tuple[str, str]]:
+    """Query parameters shared by the transaction list endpoints."""
+    if isinstance(account_keys, str):
+        account_keys = [account_keys]
+    params = [("accountKey", k) for k in account_keys]
+    if from_date:
+        params.append(("fromDate", from_date.strftime("%Y-%m-%d")))
+    if to_date:
+        params.append(("toDate", to_date.strftime("%Y-%m-%d")))
+    if row_limit:
+        params.append(("rowLimit", str(row_limit)))
+    if transaction_source:
+        params.append(("transactionSource", ", ".join(transaction_source)))
+    if enrich_with_payment_details is not None:
+        params.append(
+            ("enrichWithPaymentDetails", str(enrich_with_payment_details).lower())
+        )
+    return params
+
+
+def date_windows(
+    from_date: date, to_date: date, days: int
+) -> Iterator[tuple[date, date]]:
+    """Split an inclusive date range into consecutive windows of at most days."""
+    start = from_date
+    while start <= to_date:
+        end = min(start + timedelta(days=days - 1), to_date)
+        yield start, end
+        start = end + timedelta(days=1)
 
 
 class TransactionsAPI:
@@ -23,21 +87,14 @@ class TransactionsAPI:
         enrich_with_payment_details: bool | None = None,
     ):
         """GET /transactions - List transactions entities"""
-        if account_keys is str:
-            account_keys = [account_keys]
-        params = [("accountKey", k) for k in account_keys]
-        if from_date:
-            params.append(("fromDate", from_date.strftime("%Y-%m-%d")))
-        if to_date:
-            params.append(("toDate", to_date.strftime("%Y-%m-%d")))
-        if row_limit:
-            params.append(("rowLimit", str(row_limit)))
-        if transaction_source:
-            params.append(("transactionSource", ", ".join(transaction_source)))
-        if enrich_with_payment_details is not None:
-            params.append(
-                ("enrichWithPaymentDetails", str(enrich_with_payment_details).lower())
-            )
+        params = transaction_params(
+            account_keys,
+            from_date,
+            to_date,
+            row_limit,
+            transaction_source,
+            enrich_with_payment_details,
+        )
         response = self.api.getApi(
             "transactions", params=params, headers={"Accept": self.API_VERSION}
         )
@@ -45,6 +102,294 @@ class TransactionsAPI:
             raise APIError(response.status_code, response.text)
         return response.json()
 
+    def list_transaction_models(
+        self,
+        account_keys: list[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+        row_limit: int | None = None,
+        transaction_source: list[Literal["RECENT", "HISTORIC", "ALL"]] | None = None,
+        enrich_with_payment_details: bool | None = None,
+        classified: bool = False,
+    ) -> "list[Transaction]":
+        """Like list_transactions, decoded into Transaction models."""
+        from .models import iter_transaction_models
+
+        return list(
+            iter_transaction_models(
+                self._list_payload(
+                    classified,
+                    account_keys,
+                    from_date,
+                    to_date,
+                    row_limit,
+                    transaction_source,
+                    enrich_with_payment_details,
+                ).get("transactions", [])
+            )
+        )
+
+    def list_transaction_batch(
+        self,
+        account_keys: list[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+        row_limit: int | None = None,
+        transaction_source: list[Literal["RECENT", "HISTORIC", "ALL"]] | None = None,
+        enrich_with_payment_details: bool | None = None,
+        classified: bool = False,
+    ) -> "TransactionBatch":
+        """Like list_transactions, decoded into a columnar TransactionBatch."""
+        from .models import TransactionBatch
+
+        return TransactionBatch.from_dicts(
+            self._list_payload(
+                classified,
+                account_keys,
+                from_date,
+                to_date,
+                row_limit,
+                transaction_source,
+                enrich_with_payment_details,
+            ).get("transactions", [])
+        )
+
+    def _list_payload(
+        self, classified: bool, *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        from .models import loads
+
+        response = self.api.getApi(
+            "transactions/classified" if classified else "transactions",
+            params=transaction_params(*args, **kwargs),
+            headers={"Accept": self.API_VERSION},
+        )
+        if not response.ok:
+            raise APIError(response.status_code, response.text)
+        return loads(response.content)
+
+    def iter_listed_transactions(
+        self,
+        account_keys: list[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+        row_limit: int | None = None,
+        transaction_source: list[Literal["RECENT", "HISTORIC", "ALL"]] | None = None,
+        enrich_with_payment_details: bool | None = None,
+        classified: bool = False,
+        enrich_with_merchant_logo: bool | None = None,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[dict[str, Any]]:
+        """Like list_transactions, but streamed: transactions are yielded as
+        they are decoded from the response body instead of after all of it
+        has been read and parsed. See jsonstream.iter_json_items.
+        """
+        from .jsonstream import iter_json_items
+
+        params = transaction_params(
+            account_keys,
+            from_date,
+            to_date,
+            row_limit,
+            transaction_source,
+            enrich_with_payment_details,
+        )
+        if classified and enrich_with_merchant_logo is not None:
+            params.append(
+                ("enrichWithMerchantLogo", str(enrich_with_merchant_logo).lower())
+            )
+        response = self.api.getApi(
+            "transactions/classified" if classified else "transactions",
+            params=params,
+            headers={"Accept": self.API_VERSION},
+            stream=True,
+        )
+        with response:
+            if not response.ok:
+                raise APIError(response.status_code, response.text)
+            yield from iter_json_items(
+                response.iter_content(chunk_size), encoding=response.encoding or "utf-8"
+            )
+
+    def iter_transactions(
+        self,
+        account_keys: list[str],
+        from_date: date,
+        to_date: date | None = None,
+        window_days: int = 31,
+        row_limit: int = 1000,
+        max_concurrency: int = 4,
+        classified: bool = False,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream transactions for a long date range, oldest first.
+
+        The range is split into windows of window_days, fetched concurrently
+        with at most max_concurrency requests in flight. A window that returns
+        row_limit rows may be truncated, so it is split in half and fetched
+        again. Transactions are de-duplicated by id across window borders.
+        Remaining keyword arguments are passed on to list_transactions or,
+        with classified=True, list_classified_transactions.
+        """
+        if to_date is None:
+            to_date = date.today()
+        max_concurrency = max(1, max_concurrency)
+        fetch = (
+            self.list_classified_transactions if classified else self.list_transactions
+        )
+        windows = date_windows(from_date, to_date, window_days)
+        pending: deque[Future[list[dict[str, Any]]]] = deque()
+        pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        previous_ids: set[str] = set()
+        try:
+            while True:
+                while len(pending) < max_concurrency:
+                    window = next(windows, None)
+                    if window is None:
+                        break
+                    pending.append(
+                        pool.submit(
+                            copy_context().run,
+                            self._fetch_window,
+                            fetch,
+                            account_keys,
+                            *window,
+                            row_limit,
+                            kwargs,
+                        )
+                    )
+                if not pending:
+                    return
+
+                ids: set[str] = set()
+                for transaction in pending.popleft().result():
+                    transaction_id = transaction.get("id")
+                    if transaction_id is not None:
+                        if transaction_id in previous_ids or transaction_id in ids:
+                            continue
+                        ids.add(transaction_id)
+                    yield transaction
+                previous_ids = ids
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_merged_transactions(
+        self,
+        account_keys: list[str],
+        from_date: date | None = None,
+        to_date: date | None = None,
+        window_days: int = 31,
+        group_size: int = 1,
+        max_concurrency: int = 8,
+        row_limit: int = 1000,
+        classified: bool = False,
+        errors: dict[str, Exception] | None = None,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Fetch accounts concurrently and stream one stream ordered by date.
+
+        Accounts are requested separately (or in groups of group_size), at
+        most max_concurrency at a time, one date window at a time with the
+        next window prefetched. Each window is k-way merged by date, so
+        memory is bounded by two windows. Without from_date a single request
+        per group is made. A failing group is recorded in errors (by account
+        key) and dropped from later windows, without affecting the others.
+        """
+        fetch = (
+            self.list_classified_transactions if classified else self.list_transactions
+        )
+        if from_date is None:
+            windows: list[tuple[date | None, date | None]] = [(None, to_date)]
+        else:
+            windows = list(
+                date_windows(from_date, to_date or date.today(), window_days)
+            )
+        group_size = max(1, group_size)
+        groups = [
+            account_keys[i : i + group_size]
+            for i in range(0, len(account_keys), group_size)
+        ]
+        failed: dict[str, Exception] = errors if errors is not None else {}
+        pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+
+        def submit(
+            window: tuple[date | None, date | None],
+        ) -> list[tuple[list[str], Future[list[dict[str, Any]]]]]:
+            return [
+                (
+                    group,
+                    pool.submit(
+                        copy_context().run,
+                        self._fetch_window,
+                        fetch,
+                        group,
+                        *window,
+                        row_limit,
+                        kwargs,
+                    ),
+                )
+                for group in groups
+                if not any(key in failed for key in group)
+            ]
+
+        try:
+            pending = submit(windows[0])
+            for i in range(len(windows)):
+                prefetched = submit(windows[i + 1]) if i + 1 < len(windows) else []
+                results = []
+                for group, future in pending:
+                    if any(key in failed for key in group):
+                        # Failed in an earlier window after this one was prefetched
+                        _ = future.cancel()
+                        continue
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        if errors is None:
+                            warnings.warn(f"Skipping accounts {group}: {e}")
+                        for key in group:
+                            failed[key] = e
+                yield from heapq.merge(*results, key=transaction_sort_key)
+                pending = prefetched
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_window(
+        self,
+        fetch: Callable[..., dict[str, Any]],
+        account_keys: list[str],
+        from_date: date | None,
+        to_date: date | None,
+        row_limit: int,
+        kwargs: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """Fetch one window sorted by date, splitting it while it hits row_limit.
+
+        Windows without dates, or of a single day, are returned as they are,
+        with a warning when they may have been truncated.
+        """
+        transactions = fetch(
+            account_keys,
+            from_date=from_date,
+            to_date=to_date,
+            row_limit=row_limit,
+            **kwargs,
+        ).get("transactions", [])
+        if len(transactions) < row_limit:
+            return sorted(transactions, key=transaction_sort_key)
+        if from_date is None or to_date is None or from_date >= to_date:
+            warnings.warn(
+                f"{len(transactions)} transactions from {from_date} to {to_date}, "
+                f"the result may be truncated by row_limit={row_limit}"
+            )
+            return sorted(transactions, key=transaction_sort_key)
+        middle = from_date + (to_date - from_date) // 2
+        return self._fetch_window(
+            fetch, account_keys, from_date, middle, row_limit, kwargs
+        ) + self._fetch_window(
+            fetch, account_keys, middle + timedelta(days=1), to_date, row_limit, kwargs
+        )
+
     def export_transactions_to_csv(
         self, account_key: str, from_date: date, to_date: date
     ):
@@ -62,6 +407,61 @@ class TransactionsAPI:
             raise APIError(response.status_code, response.text)
         return response.content
 
+    def iter_export_chunks(
+        self,
+        account_key: str,
+        from_date: date,
+        to_date: date,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[bytes]:
+        """Stream the raw CSV export in chunks instead of buffering the body."""
+        response = self.api.getApi(
+            "transactions/export",
+            params={
+                "accountKey": account_key,
+                "fromDate": from_date,
+                "toDate": to_date,
+            },
+            headers={"Accept": "application/csv;charset=UTF-8"},
+            stream=True,
+        )
+        with response:
+            if not response.ok:
+                raise APIError(response.status_code, response.text)
+            yield from response.iter_content(chunk_size=chunk_size)
+
+    def iter_exported_transactions(
+        self, account_key: str, from_date: date, to_date: date, **kwargs: Any
+    ) -> Iterator[dict[str, Any]]:
+        """Stream the CSV export as typed records (dates and Decimal amounts).
+
+        Keyword arguments are passed on to csvexport.iter_csv_records.
+        """
+        from .csvexport import iter_csv_records
+
+        return iter_csv_records(
+            self.iter_export_chunks(account_key, from_date, to_date), **kwargs
+        )
+
+    def export_transactions_to_file(
+        self,
+        account_key: str,
+        from_date: date,
+        to_date: date,
+        file: str | IO[bytes],
+    ) -> int:
+        """Write the CSV export to a path or binary file, returning bytes written.
+
+        The path is only opened once the export has started, so an error
+        response leaves an existing file untouched.
+        """
+        chunks = self.iter_export_chunks(account_key, from_date, to_date)
+        first = next(chunks, b"")
+        if isinstance(file, str):
+            with open(file, "wb") as f:
+                return f.write(first) + sum(f.write(chunk) for chunk in chunks)
+        return file.write(first) + sum(file.write(chunk) for chunk in chunks)
+
     def list_classified_transactions(
         self,
         account_keys: list[str],
@@ -73,21 +473,14 @@ class TransactionsAPI:
         enrich_with_merchant_logo: bool | None = None,
     ):
         """GET /transactions/classified - List transactions entities with classification"""
-        if account_keys is str:
-            account_keys = [account_keys]
-        params = [("accountKey", k) for k in account_keys]
-        if from_date:
-            params.append(("fromDate", from_date.strftime("%Y-%m-%d")))
-        if to_date:
-            params.append(("toDate", to_date.strftime("%Y-%m-%d")))
-        if row_limit:
-            params.append(("rowLimit", str(row_limit)))
-        if transaction_source:
-            params.append(("transactionSource", ", ".join(transaction_source)))
-        if enrich_with_payment_details is not None:
-            params.append(
-                ("enrichWithPaymentDetails", str(enrich_with_payment_details).lower())
-            )
+        params = transaction_params(
+            account_keys,
+            from_date,
+            to_date,
+            row_limit,
+            transaction_source,
+            enrich_with_payment_details,
+        )
         if enrich_with_merchant_logo is not None:
             params.append(
                 ("enrichWithMerchantLogo", str(enrich_with_merchant_logo).lower())
@@ -116,8 +509,8 @@ class TransactionsAPI:
         response = self.api.getApi(
             f"transactions/{transaction_id}/details/classified",
             params=(
-                enrich_with_merchant_data is not None
-                if {"enrichWithMerchantData": enrich_with_merchant_data}
+                {"enrichWithMerchantData": enrich_with_merchant_data}
+                if enrich_with_merchant_data is not None
                 else None
             ),
             headers={"Accept": self.API_VERSION},
@@ -125,3 +518,49 @@ class TransactionsAPI:
         if not response.ok:
             raise APIError(response.status_code, response.text)
         return response.json()
+
+    def get_details_many(
+        self,
+        transaction_ids: list[str],
+        classified: bool = False,
+        cache: TransactionDetailsCache | None = None,
+        max_concurrency: int = 8,
+        enrich_with_merchant_data: Any = None,
+        rate: float | None = None,
+    ) -> tuple[list[dict[str, Any] | None], dict[str, Exception]]:
+        """Fetch details for many transactions.
+
+        Ids are de-duplicated, served from cache when possible, and the rest
+        are fetched concurrently. rate limits these fetches per second on top
+        of the client's scheduler, which is unlimited unless rate_limit is
+        configured. Booked details never change, so they are stored in the
+        cache indefinitely. Returns (details, errors): details in input
+        order, with None where the fetch failed, and errors keyed by
+        transaction id.
+        """
+        from .concurrency import map_concurrent
+        from .scheduler import TokenBucket
+
+        bucket = TokenBucket(rate, max_concurrency) if rate else None
+
+        kind = "details"
+        if classified:
+            kind = f"classified:{enrich_with_merchant_data}"
+        cached = cache.get_many(kind, transaction_ids) if cache else {}
+
+        def fetch(transaction_id: str) -> dict[str, Any]:
+            if bucket is not None:
+                sleep(bucket.reserve())
+            if classified:
+                return self.get_classified_transaction_details(
+                    transaction_id, enrich_with_merchant_data
+                )
+            return self.get_transaction_details(transaction_id)
+
+        fetched, errors = map_concurrent(
+            fetch, (i for i in transaction_ids if i not in cached), max_concurrency
+        )
+        if cache:
+            cache.put_many(kind, fetched)
+        found = cached | fetched
+        return [found.get(i) for i in transaction_ids], errors
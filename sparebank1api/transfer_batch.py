@@ -0,0 +1,261 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date
+from time import perf_counter, sleep, time
+from typing import TYPE_CHECKING, Any, Iterable, Literal
+
+import requests
+
+from .apierror import APIError
+from .concurrency import map_concurrent
+from .scheduler import TokenBucket
+
+if TYPE_CHECKING:
+    from .transfers import TransfersAPI
+
+TransferKind = Literal["debit", "creditcard", "pension"]
+TransferStatus = Literal["succeeded", "failed", "in_doubt"]
+
+
+@dataclass(slots=True, frozen=True)
+class TransferSpec:
+    """One transfer in a batch.
+
+    key is a client-generated idempotency key and must be stable across runs
+    (e.g. derived from the payroll line), so a resumed batch recognizes it.
+    to is the destination account, credit card account id or policy number,
+    depending on kind.
+    """
+
+    key: str
+    kind: TransferKind
+    amount: float
+    from_account: str
+    to: str
+    currency_code: str = "NOK"
+    due_date: date | None = None
+    message: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["due_date"] = self.due_date.isoformat() if self.due_date else None
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class TransferResult:
+    key: str
+    status: TransferStatus
+    result: Any = None
+    error: str | None = None
+    resumed: bool = False
+
+
+class TransferJournal:
+    """Append-only JSON Lines write-ahead log of transfer intents and outcomes.
+
+    Every record is flushed and fsynced before the call returns, so an
+    intent is on disk before its transfer is submitted. A record torn by a
+    crash mid-write (the last line, without its newline or unparsable) is
+    dropped and truncated away on open; anything damaged before it raises
+    ValueError rather than silently losing later records.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.intents: dict[str, dict[str, Any]] = {}
+        self.outcomes: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            valid = self._replay(data)
+            if valid < len(data):
+                with open(path, "r+b") as f:
+                    _ = f.truncate(valid)
+                    os.fsync(f.fileno())
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _replay(self, data: bytes) -> int:
+        """Apply the complete records in data, returning their length in bytes."""
+        lines = data.split(b"\n")
+        torn = lines.pop() != b""
+        valid = 0
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line) if line.strip() else None
+            except ValueError:
+                if number < len(lines) or torn:
+                    raise ValueError(
+                        f"{self.path}: corrupt journal record on line {number}"
+                    ) from None
+                break
+            if record is not None:
+                self._apply(record)
+            valid += len(line) + 1
+        return valid
+
+    def _apply(self, record: dict[str, Any]):
+        if record["state"] == "intent":
+            self.intents[record["key"]] = record["spec"]
+        else:
+            self.outcomes[record["key"]] = record
+
+    def append(self, key: str, state: str, **fields: Any):
+        record = {"key": key, "state": state, "time": time(), **fields}
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            _ = self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._apply(record)
+
+    def close(self):
+        self._file.close()
+
+
+def _is_definite_failure(error: Exception) -> bool:
+    """Whether error proves the transfer was not executed."""
+    if isinstance(error, APIError):
+        return error.status_code < 500
+    return isinstance(error, requests.ConnectTimeout)
+
+
+class TransferBatchExecutor:
+    """Submits transfers concurrently with a write-ahead journal.
+
+    Each transfer's intent is journaled before it is submitted, and its
+    outcome after. Running the same batch again with the same journal skips
+    keys that already have an outcome and returns the recorded one. A
+    transfer whose outcome is unknown (the process crashed, the connection
+    dropped or the server answered 5xx) is reported as in_doubt and is never
+    resubmitted automatically; check it against the account's transactions
+    and record the answer with resolve().
+    """
+
+    def __init__(
+        self,
+        transfers: "TransfersAPI",
+        journal_path: str = "transfers.jsonl",
+        max_concurrency: int = 4,
+        rate: float | None = None,
+    ):
+        """rate limits submissions per second on top of the client's scheduler."""
+        self.transfers = transfers
+        self.journal = TransferJournal(journal_path)
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, max_concurrency) if rate else None
+
+    def close(self):
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    def resolve(self, key: str, succeeded: bool, result: Any = None):
+        """Record the outcome of an in_doubt transfer after checking it manually."""
+        if key not in self.journal.intents:
+            raise KeyError(key)
+        self.journal.append(
+            key,
+            "succeeded" if succeeded else "failed",
+            result=result,
+            error=None if succeeded else "resolved as failed",
+        )
+
+    def _submit(self, spec: TransferSpec) -> Any:
+        if spec.kind == "debit":
+            return self.transfers.transfer_between_accounts(
+                spec.amount,
+                spec.from_account,
+                spec.to,
+                currency_code=spec.currency_code,
+                due_date=spec.due_date,
+                message=spec.message,
+            )
+        if spec.kind == "creditcard":
+            return self.transfers.transfer_to_credit_card(
+                spec.amount, spec.from_account, spec.to, due_date=spec.due_date
+            )
+        if spec.kind == "pension":
+            return self.transfers.transfer_to_pension(
+                spec.amount, spec.from_account, spec.to, due_date=spec.due_date
+            )
+        raise ValueError(f"Unknown transfer kind: {spec.kind}")
+
+    def _execute_one(self, spec: TransferSpec) -> TransferResult:
+        if self.bucket is not None:
+            sleep(self.bucket.reserve())
+        self.journal.append(spec.key, "intent", spec=spec.to_dict())
+        try:
+            result = self._submit(spec)
+        except Exception as e:
+            status = "failed" if _is_definite_failure(e) else "in_doubt"
+            self.journal.append(spec.key, status, error=repr(e))
+            return TransferResult(spec.key, status, error=repr(e))
+        self.journal.append(spec.key, "succeeded", result=result)
+        return TransferResult(spec.key, "succeeded", result=result)
+
+    def execute(
+        self, specs: Iterable[TransferSpec]
+    ) -> tuple[list[TransferResult], dict[str, float]]:
+        """Run the batch, returning per-transfer results in input order and stats."""
+        specs = list(specs)
+        by_key: dict[str, TransferSpec] = {}
+        for spec in specs:
+            if spec.key in by_key:
+                raise ValueError(f"Duplicate transfer key: {spec.key}")
+            intent = self.journal.intents.get(spec.key)
+            if intent is not None and intent != spec.to_dict():
+                raise ValueError(
+                    f"Transfer {spec.key} differs from the journaled transfer."
+                )
+            by_key[spec.key] = spec
+
+        results: dict[str, TransferResult] = {}
+        pending = []
+        for spec in specs:
+            outcome = self.journal.outcomes.get(spec.key)
+            if outcome is not None:
+                results[spec.key] = TransferResult(
+                    spec.key,
+                    outcome["state"],
+                    outcome.get("result"),
+                    outcome.get("error"),
+                    resumed=True,
+                )
+            elif spec.key in self.journal.intents:
+                # Submitted by a run that crashed before recording the outcome
+                self.journal.append(spec.key, "in_doubt", error="interrupted")
+                results[spec.key] = TransferResult(
+                    spec.key, "in_doubt", error="interrupted", resumed=True
+                )
+            else:
+                pending.append(spec.key)
+
+        start = perf_counter()
+        submitted, errors = map_concurrent(
+            lambda key: self._execute_one(by_key[key]), pending, self.max_concurrency
+        )
+        seconds = perf_counter() - start
+        results.update(submitted)
+        for key, error in errors.items():
+            results[key] = TransferResult(key, "in_doubt", error=repr(error))
+
+        ordered = [results[spec.key] for spec in specs]
+        stats: dict[str, float] = {
+            "total": len(specs),
+            "submitted": len(pending),
+            "resumed": len(specs) - len(pending),
+            "succeeded": sum(r.status == "succeeded" for r in ordered),
+            "failed": sum(r.status == "failed" for r in ordered),
+            "in_doubt": sum(r.status == "in_doubt" for r in ordered),
+            "seconds": seconds,
+            "per_second": len(pending) / seconds if seconds else 0.0,
+        }
+        return ordered, stats
@@ -36,6 +36,7 @@ class TransfersAPI:
         )
         if not response.ok:
             raise APIError(response.status_code, response.text)
+        self.api.invalidate_cache("accounts")
         return response.json()
 
     def transfer_between_accounts(
@@ -66,6 +67,7 @@ class TransfersAPI:
         )
         if not response.ok:
             raise APIError(response.status_code, response.text)
+        self.api.invalidate_cache("accounts")
         return response.json()
 
     def transfer_to_pension(
@@ -90,4 +92,5 @@ class TransfersAPI:
         )
         if not response.ok:
             raise APIError(response.status_code, response.text)
+        self.api.invalidate_cache("accounts")
         return response.json()
@@ -0,0 +1,42 @@
+from typing import Iterator
+
+import pytest
+
+from benchmarks.mock_server import MockServer, MockSettings
+from sparebank1api.api import SpareBank1API
+from sparebank1api.config import Config
+from sparebank1api.tokenstore import MemoryTokenStore
+
+from .helpers import valid_token
+
+
+@pytest.fixture
+def mock_server() -> Iterator[MockServer]:
+    with MockServer(MockSettings(latency=0, jitter=0, accounts=4)) as server:
+        yield server
+
+
+@pytest.fixture
+def config(tmp_path, mock_server: MockServer, monkeypatch) -> Config:
+    for name in ("BASE_URL", "CLIENT_ID", "TOKEN_STORE", "TOKEN_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    path = tmp_path / "config.ini"
+    _ = path.write_text(
+        "[DEFAULT]\n"
+        f"base_url = {mock_server.url}\n"
+        "client_id = test-client\n"
+        "client_secret = test-secret\n"
+        "redirect_uri = http://localhost:8321/callback\n"
+        "fin_inst = fid-test\n"
+        "token_store = memory\n"
+    )
+    return Config(str(path))
+
+
+@pytest.fixture
+def api(config: Config) -> Iterator[SpareBank1API]:
+    store = MemoryTokenStore()
+    store.save("token", valid_token())
+    with SpareBank1API(config, token_store=store) as api:
+        api.authenticate()
+        yield api
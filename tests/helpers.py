@@ -0,0 +1,9 @@
+from time import time
+
+
+def valid_token(expires_in: int = 3600, refresh_token: str = "refresh"):
+    return {
+        "access_token": "access",
+        "expires_at": int(time()) + expires_in,
+        "refresh_token": refresh_token,
+    }
@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.cache import DiskCache, ResponseCache
+from sparebank1api.config import Config
+from sparebank1api.tokenstore import MemoryTokenStore
+
+from .helpers import valid_token
+
+
+def make_api(config: Config, cache: DiskCache, refresh_token: str) -> SpareBank1API:
+    store = MemoryTokenStore()
+    store.save("token", valid_token(refresh_token=refresh_token))
+    api = SpareBank1API(config, cache=cache, token_store=store)
+    api.authenticate()
+    return api
+
+
+def test_disk_cache_round_trip_without_credentials(tmp_path, config, mock_server):
+    path = str(tmp_path / "cache.sqlite")
+    cache = DiskCache(path)
+    with make_api(config, cache, "user-a") as api:
+        accounts = api.accounts.list_accounts()
+        assert api.accounts.list_accounts() == accounts
+    assert cache.stats["hits"] == 1
+    assert mock_server.counts["GET"] == 1
+    cache.close()
+
+    with sqlite3.connect(path) as db:
+        rows = db.execute("SELECT * FROM http_responses").fetchall()
+    assert len(rows) == 1
+    assert not any(b"Bearer" in str(column).encode() for column in rows[0])
+
+    restarted = DiskCache(path)
+    with make_api(config, restarted, "user-a") as api:
+        assert api.accounts.list_accounts() == accounts
+    assert restarted.stats["hits"] == 1
+    assert mock_server.counts["GET"] == 1
+
+
+def test_disk_cache_is_scoped_to_the_authorization(tmp_path, config, mock_server):
+    path = str(tmp_path / "cache.sqlite")
+    with make_api(config, DiskCache(path), "user-a") as api:
+        _ = api.accounts.list_accounts()
+
+    cache = DiskCache(path)
+    with make_api(config, cache, "user-b") as api:
+        _ = api.accounts.list_accounts()
+    assert cache.stats == {"hits": 0, "misses": 1, "revalidated": 0, "evictions": 0}
+    assert mock_server.counts["GET"] == 2
+
+
+def test_incomplete_cache_backend_fails_on_creation():
+    class NoInvalidate(ResponseCache):
+        def get(self, key: str):
+            return None
+
+        def set(self, key: str, entry):
+            pass
+
+    with pytest.raises(TypeError):
+        _ = NoInvalidate()
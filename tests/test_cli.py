@@ -0,0 +1,59 @@
+import argparse
+import io
+import json
+import threading
+
+import pytest
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.apierror import APIError
+from sparebank1api.cli import build_parser, cmd_balances, write_rows
+
+
+def test_csv_header_from_first_row_rejects_new_fields():
+    out = io.StringIO()
+    rows = [{"a": 1, "b": {"x": 1}}, {"a": 2}, {"a": 3, "c": 4}]
+    with pytest.raises(ValueError, match="c"):
+        _ = write_rows(iter(rows), "csv", out)
+    assert out.getvalue().splitlines() == ["a,b", '1,"{""x"": 1}"', "2,"]
+
+
+def test_csv_header_from_columns():
+    out = io.StringIO()
+    args = build_parser().parse_args(
+        ["--format", "csv", "--columns", "a, c", "sync", "db"]
+    )
+    rows = [{"a": 1}, {"a": 3, "c": 4}]
+    assert write_rows(rows, args.format, out, args.columns) == 2
+    assert out.getvalue().splitlines() == ["a,c", "1,", "3,4"]
+
+
+def test_balances_are_written_as_they_complete(api: SpareBank1API, monkeypatch):
+    written = threading.Event()
+    get_account_balance = api.accounts.get_account_balance
+
+    def balance(number: str):
+        if number == "slow":
+            assert written.wait(5), "slow balance held back the others"
+        if number == "broken":
+            raise APIError(404, "no such account")
+        return get_account_balance(number)
+
+    class Output(io.StringIO):
+        def write(self, s: str) -> int:
+            written.set()
+            return super().write(s)
+
+    monkeypatch.setattr(api.accounts, "get_account_balance", balance)
+    args = argparse.Namespace(
+        accounts=["slow", "fast", "broken"],
+        concurrency=3,
+        format="ndjson",
+        columns=None,
+    )
+    out = Output()
+    assert cmd_balances(api, args, out) == 2
+    numbers = [
+        json.loads(line)["accountNumber"] for line in out.getvalue().splitlines()
+    ]
+    assert numbers == ["fast", "slow"]
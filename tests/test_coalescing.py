@@ -0,0 +1,48 @@
+import threading
+from typing import Any
+
+import pytest
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.apierror import APIError
+
+
+def concurrent_list_accounts(api: SpareBank1API, count: int) -> list[Any]:
+    barrier = threading.Barrier(count)
+    results: list[Any] = [None] * count
+
+    def call(i: int):
+        barrier.wait()
+        results[i] = api.accounts.list_accounts()
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize("coalesce, upstream", [(True, 1), (False, 8)])
+def test_identical_concurrent_gets_share_one_request(
+    api: SpareBank1API, mock_server, coalesce: bool, upstream: int
+):
+    mock_server.settings.latency = 0.3
+    api._base.coalesce = coalesce
+    results = concurrent_list_accounts(api, 8)
+    assert mock_server.counts["GET"] == upstream
+    assert all(r == results[0] for r in results)
+    # Each caller parses its own copy of the shared body
+    results[0].clear()
+    assert results[1]
+
+
+def test_coalesced_failure_is_not_remembered(api: SpareBank1API, mock_server):
+    mock_server.settings.latency = 0.3
+    mock_server.settings.error_rate = 1.0
+    api._base.scheduler.max_retries = 0
+    with pytest.raises(APIError):
+        _ = api.accounts.list_accounts()
+    mock_server.settings.error_rate = 0.0
+    assert api.accounts.list_accounts()
+    assert not api._base._inflight
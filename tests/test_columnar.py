@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+import pytest
+
+from sparebank1api.models import TransactionBatch
+
+np = pytest.importorskip("numpy")
+from sparebank1api.columnar import TransactionColumns  # noqa: E402
+
+TRANSACTIONS = [
+    {"id": "1", "amount": 0.285, "accountKey": "A", "date": 1704110400000},
+    {"id": "2", "amount": 1.005, "accountKey": "B", "date": 1706788800000},
+    {"id": "3", "amount": -12.345, "accountKey": None, "date": None},
+    {"id": "4", "amount": 19.99, "accountKey": "A", "date": 1704110400000},
+]
+
+
+def test_columns_and_batch_share_the_amount_rule():
+    batch = TransactionBatch.from_dicts(TRANSACTIONS)
+    columns = TransactionColumns.from_transactions(TRANSACTIONS, chunk_size=3)
+    assert columns.data["amount"].tolist() == list(batch.amounts)
+    assert columns.account_keys == ["A", "B"]
+    assert columns.data["account"].tolist() == [0, 1, -1, 0]
+    assert columns.sum_by_account() == {
+        "A": batch.amount_at(0) + batch.amount_at(3),
+        "B": batch.amount_at(1),
+    }
+    assert columns.sum_by_month() == {
+        "2024-01": Decimal("20.27"),
+        "2024-02": Decimal("1.00"),
+    }
@@ -0,0 +1,42 @@
+from time import perf_counter
+from typing import Any
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.store import TransactionDetailsCache
+
+
+def test_details_are_fetched_once_and_only_booked_ones_cached(
+    api: SpareBank1API, monkeypatch, tmp_path
+):
+    fetched: list[str] = []
+    statuses = {"a": "BOOKED", "b": "PENDING", "c": None}
+
+    def details(transaction_id: str) -> dict[str, Any]:
+        fetched.append(transaction_id)
+        if statuses[transaction_id] is None:
+            return {"id": transaction_id}
+        return {"id": transaction_id, "bookingStatus": statuses[transaction_id]}
+
+    monkeypatch.setattr(api.transactions, "get_transaction_details", details)
+    cache = TransactionDetailsCache(str(tmp_path / "details.sqlite"))
+
+    found, errors = api.transactions.get_details_many(["a", "b", "a", "c"], cache=cache)
+    assert [d and d["id"] for d in found] == ["a", "b", "a", "c"]
+    assert errors == {}
+    assert sorted(fetched) == ["a", "b", "c"]
+
+    fetched.clear()
+    _ = api.transactions.get_details_many(["a", "b", "c"], cache=cache)
+    assert sorted(fetched) == ["b", "c"]
+
+
+def test_details_fetches_respect_rate(api: SpareBank1API, monkeypatch):
+    monkeypatch.setattr(
+        api.transactions, "get_transaction_details", lambda i: {"id": i}
+    )
+    ids = [str(i) for i in range(10)]
+    start = perf_counter()
+    found, _ = api.transactions.get_details_many(ids, max_concurrency=2, rate=50)
+    # a burst of 2, then 8 more at 50/s
+    assert perf_counter() - start >= 0.15
+    assert len(found) == 10
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from sparebank1api.jsonstream import iter_json_items
+
+TRANSACTIONS = [
+    {"id": "a", "amount": -12345.678, "description": 'Kafé "Blåbær" \\ æøå'},
+    {"id": "b", "amount": 1e-5, "date": 1704067200000, "tags": [1, 2, [3]]},
+    {"id": "c", "amount": 100, "remote": {"name": "☃ snowman", "n": None}},
+]
+BODY = json.dumps(
+    {"errors": [], "transactions": TRANSACTIONS, "_links": {"next": None}},
+    ensure_ascii=False,
+).encode("utf-8")
+
+
+def split(body: bytes, size: int) -> list[bytes]:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, len(BODY)])
+def test_items_survive_any_chunk_boundary(size: int):
+    assert list(iter_json_items(split(BODY, size))) == TRANSACTIONS
+
+
+def test_every_two_chunk_split():
+    # Covers cuts inside every string, escape, number and multi-byte character
+    for i in range(len(BODY) + 1):
+        assert list(iter_json_items([BODY[:i], BODY[i:]])) == TRANSACTIONS
+
+
+@pytest.mark.parametrize(
+    "body,expected",
+    [
+        (b'{"transactions": []}', []),
+        (b"{}", []),
+        (b'{"other": [1, 2]}', []),
+        (b' { "transactions" : [ 1 , 2.5 , -3e2 ] } ', [1, 2.5, -300.0]),
+        (
+            b'{"transactions": [12.5e-1, -0.25, 1E+2, true, null]}',
+            [1.25, -0.25, 100.0, True, None],
+        ),
+    ],
+)
+def test_edge_cases(body: bytes, expected: list):
+    assert list(iter_json_items(split(body, 1))) == expected
+
+
+def test_body_truncated_inside_the_array_raises():
+    with pytest.raises(ValueError):
+        _ = list(iter_json_items(split(BODY[: len(BODY) // 2], 4)))
@@ -0,0 +1,21 @@
+from datetime import date
+from decimal import Decimal
+
+from sparebank1api.models import Transaction, TransactionBatch, to_date
+
+# 2023-12-31T23:00Z: midnight on New Year's Day in Oslo
+NEW_YEAR = 1704063600000
+
+
+def test_to_date_uses_norwegian_calendar_day():
+    assert to_date(NEW_YEAR) == date(2024, 1, 1)
+    assert to_date("2024-01-01T00:00:00+01:00") == date(2024, 1, 1)
+    assert to_date(None) is None
+
+
+def test_models_and_batch_agree_on_dates():
+    data = {"id": "1", "accountKey": "A", "date": NEW_YEAR, "amount": 0.1}
+    transaction = Transaction.from_dict(data)
+    batch = TransactionBatch.from_dicts([data])
+    assert transaction.date == batch.date_at(0) == date(2024, 1, 1)
+    assert transaction.amount == batch.amount_at(0) == Decimal("0.1")
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+from typing import Any
+
+from sparebank1api.apierror import APIError
+from sparebank1api.poller import ChangePoller
+
+
+class FakeBank:
+    """Stands in for SpareBank1API with one mutable account."""
+
+    def __init__(self):
+        self.balance = 100.0
+        self.transactions: list[dict[str, Any]] = []
+        self.fail_listings = 0
+        self.accounts = SimpleNamespace(get_account_balance=self.get_account_balance)
+        self.transactions_api = SimpleNamespace(
+            list_transactions=self.list_transactions
+        )
+
+    def get_account_balance(self, account_number: str) -> dict[str, Any]:
+        return {"availableBalance": self.balance, "bookedBalance": self.balance}
+
+    def list_transactions(self, account_keys: list[str], **kwargs: Any):
+        if self.fail_listings:
+            self.fail_listings -= 1
+            raise APIError(503, "unavailable")
+        return {"transactions": list(self.transactions)}
+
+
+def make_poller(bank: FakeBank, interval: float = 0) -> ChangePoller:
+    api: Any = SimpleNamespace(
+        accounts=bank.accounts, transactions=bank.transactions_api
+    )
+    return ChangePoller(
+        api,
+        {"K": "1234"},
+        requests_per_minute=6000,
+        min_interval=interval,
+        max_interval=interval,
+    )
+
+
+def test_failed_listing_is_retried_by_next_poll():
+    bank = FakeBank()
+    poller = make_poller(bank)
+    assert poller.poll_due() == []
+
+    bank.balance = 200.0
+    bank.transactions.append({"id": "t1", "amount": 100.0, "date": 1})
+    bank.fail_listings = 1
+    assert poller.poll_due() == []
+    assert poller.stats["errors"] == 1
+
+    events = poller.poll_due()
+    assert [e.kind for e in events] == ["balance", "new_transaction"]
+    assert events[0].delta == 100
+    assert poller.poll_due() == []
+
+
+def test_rewatch_does_not_double_the_poll_rate(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("sparebank1api.poller.monotonic", lambda: clock[0])
+    bank = FakeBank()
+    poller = make_poller(bank, interval=60)
+    _ = poller.poll_due()
+
+    clock[0] = 30
+    poller.unwatch("K")
+    poller.watch("K", "1234")
+    _ = poller.poll_due()
+    for now in range(40, 300, 10):
+        clock[0] = now
+        _ = poller.poll_due()
+
+    # Polled at 0, 30, then every 60 seconds: 90, 150, 210, 270
+    assert poller.stats["polls"] == 6
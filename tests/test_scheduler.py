@@ -0,0 +1,86 @@
+import io
+
+import pytest
+import requests
+
+from sparebank1api import scheduler as scheduler_module
+from sparebank1api.scheduler import RequestScheduler, parse_retry_after
+
+
+def response(status: int, retry_after: str | None = None) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.raw = io.BytesIO(b"")
+    if retry_after is not None:
+        r.headers["Retry-After"] = retry_after
+    return r
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    slept: list[float] = []
+    monkeypatch.setattr(scheduler_module, "sleep", slept.append)
+    return slept
+
+
+def replay(*outcomes: int | Exception):
+    calls = iter(outcomes)
+
+    def send() -> requests.Response:
+        outcome = next(calls)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return response(outcome)
+
+    return send
+
+
+def test_idempotent_request_is_retried_until_success(sleeps):
+    scheduler = RequestScheduler(max_retries=3)
+    send = replay(503, requests.ConnectionError(), 502, 200)
+    assert scheduler.send(send, idempotent=True).status_code == 200
+    assert scheduler.stats["retries"] == 3
+    assert len(sleeps) == 3
+
+
+@pytest.mark.parametrize("outcome", [503, 429, requests.ConnectionError()])
+def test_non_idempotent_request_is_not_retried(sleeps, outcome):
+    scheduler = RequestScheduler(max_retries=3)
+    send = replay(outcome, 200)
+    if isinstance(outcome, Exception):
+        with pytest.raises(requests.ConnectionError):
+            _ = scheduler.send(send, idempotent=False)
+    else:
+        assert scheduler.send(send, idempotent=False).status_code == outcome
+    assert scheduler.stats["retries"] == 0
+    assert sleeps == []
+
+
+def test_client_errors_are_not_retried(sleeps):
+    scheduler = RequestScheduler(max_retries=3)
+    assert scheduler.send(replay(404, 200), idempotent=True).status_code == 404
+    assert scheduler.stats["retries"] == 0
+
+
+def test_retries_stop_at_max_retries(sleeps):
+    scheduler = RequestScheduler(max_retries=2)
+    send = replay(500, 500, 500, 200)
+    assert scheduler.send(send, idempotent=True).status_code == 500
+    assert scheduler.stats["retries"] == 2
+
+
+def test_retry_after_is_honoured_and_pauses_the_bucket(sleeps):
+    scheduler = RequestScheduler(rate=1000, burst=10, max_retries=1)
+    outcomes = iter([response(429, "2"), response(200)])
+    assert scheduler.send(lambda: next(outcomes), idempotent=True).status_code == 200
+    assert 2 in sleeps
+    assert scheduler.stats["throttled"] == 1
+    assert scheduler.bucket is not None and scheduler.bucket.reserve() > 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from typing import Iterator
+
+import pytest
+import requests
+
+from sparebank1api.client import BaseAPI
+from sparebank1api.config import Config
+from sparebank1api.server import CallbackServer
+from sparebank1api.tokenstore import MemoryTokenStore
+
+
+@pytest.fixture
+def callback_server(monkeypatch) -> Iterator[CallbackServer]:
+    with CallbackServer(port=0, host="127.0.0.1") as server:
+        monkeypatch.setenv("REDIRECT_URI", f"http://127.0.0.1:{server.port}/callback")
+        yield server
+
+
+def test_redirects_are_routed_by_state(callback_server, config: Config, mock_server):
+    store = MemoryTokenStore()
+    clients = [
+        BaseAPI(config, token_store=store, token_key=f"user-{i}") for i in range(10)
+    ]
+    flows = [callback_server.begin(client) for client in clients]
+    assert callback_server.pending() == 10
+
+    # The mock authorize endpoint redirects straight back with a code
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        responses = list(pool.map(lambda f: requests.get(f.url, timeout=5), flows))
+
+    assert [r.status_code for r in responses] == [200] * 10
+    assert callback_server.pending() == 0
+    assert mock_server.counts["token"] == 10
+    grants = set()
+    for client, flow in zip(clients, flows):
+        token = flow.done.result(timeout=5)
+        assert flow.api is client
+        assert store.load(client.token_key) == token
+        grants.add(token["grant_id"])
+    assert len(grants) == 10
+
+
+def test_unknown_state_and_authorization_errors(callback_server, config: Config):
+    client = BaseAPI(config, token_store=MemoryTokenStore())
+    flow = callback_server.begin(client)
+    base = f"http://127.0.0.1:{callback_server.port}/callback"
+
+    response = requests.get(f"{base}?code=x&state=forged", timeout=5)
+    assert response.status_code == 400
+    assert callback_server.pending() == 1
+
+    response = requests.get(f"{base}?error=access_denied&state={flow.state}", timeout=5)
+    assert response.status_code == 400
+    with pytest.raises(ValueError, match="access_denied"):
+        _ = flow.done.result(timeout=5)
+    assert client.token is None
+
+
+def test_states_expire(callback_server, config: Config):
+    callback_server.state_ttl = 0.1
+    client = BaseAPI(config, token_store=MemoryTokenStore())
+    flow = callback_server.begin(client)
+    sleep(0.2)
+
+    response = requests.get(flow.url, timeout=5)
+    assert response.status_code == 400
+    with pytest.raises(TimeoutError):
+        _ = flow.done.result(timeout=5)
+    assert callback_server.pending() == 0
+
+    # Flows nobody completes are expired by the serving loop
+    flow = callback_server.begin(client)
+    with pytest.raises(TimeoutError):
+        _ = flow.done.result(timeout=5)
+    assert callback_server.pending() == 0
@@ -0,0 +1,35 @@
+from sparebank1api.cache import MemoryCache
+from sparebank1api.tenants import TenantRegistry
+from sparebank1api.tokenstore import MemoryTokenStore
+
+from .helpers import valid_token
+
+
+def user_token(user: str):
+    token = valid_token(refresh_token=f"refresh-{user}")
+    token["access_token"] = f"access-{user}"
+    return token
+
+
+def test_views_use_their_own_token_and_cache_partition(config, mock_server):
+    cache = MemoryCache()
+    seen: list[str] = []
+    with TenantRegistry(
+        config, cache=cache, token_store=MemoryTokenStore(), max_active=1
+    ) as tenants:
+        tenants.session.hooks["response"].append(
+            lambda r, *args, **kwargs: seen.append(r.request.headers["Authorization"])
+        )
+        for user in ("alice", "bob"):
+            tenants.register(user, user_token(user))
+
+        alice = tenants["alice"].accounts.list_accounts()
+        assert tenants["alice"].accounts.list_accounts() == alice
+        # bob evicts alice's view; neither may see the other's cache entry
+        assert tenants["bob"].accounts.list_accounts() == alice
+        assert tenants["alice"].accounts.list_accounts() == alice
+        assert len(tenants) == 1
+
+    assert seen == ["Bearer access-alice", "Bearer access-bob"]
+    assert mock_server.counts["GET"] == 2
+    assert cache.stats["hits"] == 2
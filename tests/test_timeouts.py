@@ -0,0 +1,45 @@
+import pytest
+import requests
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.timeouts import DeadlineExceeded, HedgePolicy, deadline
+
+
+def test_hedge_delay_is_the_percentile_of_recent_samples():
+    policy = HedgePolicy(percentile=95, min_samples=20, min_delay=0.0, window=100)
+    for i in range(19):
+        policy.observe("accounts", 1.0)
+    assert policy.delay("accounts") is None
+
+    for i in range(1, 101):
+        policy.observe("accounts", i / 100)
+    assert policy.delay("accounts") == 0.95
+
+    # Older samples drop out of the window
+    for _ in range(100):
+        policy.observe("accounts", 0.2)
+    assert policy.delay("accounts") == 0.2
+    assert policy.delay("transactions") is None
+
+
+def test_hedge_delay_has_a_floor():
+    policy = HedgePolicy(min_samples=1, min_delay=0.05)
+    policy.observe("accounts", 0.001)
+    assert policy.delay("accounts") == 0.05
+
+
+def test_deadline_timeout_raises_deadline_exceeded(api: SpareBank1API, mock_server):
+    mock_server.settings.latency = 1.0
+    with pytest.raises(DeadlineExceeded) as info:
+        with deadline(0.3):
+            _ = api.accounts.list_accounts()
+    assert isinstance(info.value.__cause__, requests.Timeout)
+    assert mock_server.counts["GET"] == 1
+
+
+def test_own_timeout_stays_a_read_timeout(api: SpareBank1API, mock_server):
+    mock_server.settings.latency = 1.0
+    api._base.default_timeout = (5.0, 0.3)
+    with pytest.raises(requests.ReadTimeout):
+        with deadline(10):
+            _ = api.accounts.list_accounts()
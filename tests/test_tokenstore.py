@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from sparebank1api.client import BaseAPI
+from sparebank1api.tokenstore import FileTokenStore, SQLiteTokenStore, TokenStore
+
+from .helpers import valid_token
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def make_store(request, tmp_path):
+    def make() -> TokenStore:
+        # A separate store object per client, as in separate processes
+        if request.param == "file":
+            return FileTokenStore(str(tmp_path))
+        return SQLiteTokenStore(str(tmp_path / "tokens.sqlite"))
+
+    return make
+
+
+def test_stores_round_trip(make_store):
+    store = make_store()
+    assert store.load("token") is None
+    token = valid_token()
+    store.save("token", token)
+    assert make_store().load("token") == token
+
+
+def test_incomplete_store_cannot_be_instantiated():
+    class LoadOnly(TokenStore):
+        def load(self, key: str):
+            return None
+
+    with pytest.raises(TypeError):
+        _ = LoadOnly()
+
+
+def test_expired_token_is_refreshed_once(make_store, config, mock_server):
+    make_store().save("token", valid_token(expires_in=-10))
+    clients = [BaseAPI(config, token_store=make_store()) for _ in range(8)]
+    barrier = threading.Barrier(len(clients))
+    errors: list[Exception] = []
+
+    def refresh(client: BaseAPI):
+        client.token = client.token_store.load(client.token_key)
+        barrier.wait()
+        try:
+            _ = client.ensure_token()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=refresh, args=(c,)) for c in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert mock_server.counts["token"] == 1
+    stored = make_store().load("token")
+    assert stored is not None
+    assert all(c.token == stored for c in clients)
+    for client in clients:
+        client.close()
@@ -0,0 +1,113 @@
+from datetime import date
+import time
+from typing import Any
+
+import pytest
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.apierror import APIError
+from sparebank1api.transactions import booking_date
+
+KEYS = ["KEY000000", "KEY000001", "KEY000002", "KEY000003"]
+
+
+@pytest.mark.parametrize("max_concurrency", [0, 1, 4])
+def test_iter_transactions_splits_truncated_windows(
+    api: SpareBank1API, max_concurrency: int
+):
+    # 4 accounts x 5 per day x 10 days = 200 rows, above row_limit per window
+    transactions = list(
+        api.transactions.iter_transactions(
+            KEYS,
+            from_date=date(2024, 1, 1),
+            to_date=date(2024, 1, 10),
+            window_days=10,
+            row_limit=50,
+            max_concurrency=max_concurrency,
+        )
+    )
+    assert len(transactions) == 200
+    assert len({t["id"] for t in transactions}) == 200
+    dates = [t["date"] for t in transactions]
+    assert dates == sorted(dates)
+
+
+def test_merged_stream_drops_failed_account_from_later_windows(
+    api: SpareBank1API, monkeypatch
+):
+    list_transactions = api.transactions.list_transactions
+
+    def flaky(account_keys: list[str], **kwargs: Any):
+        if account_keys == ["KEY000001"] and kwargs["from_date"] == date(2024, 1, 1):
+            raise APIError(503, "unavailable")
+        return list_transactions(account_keys, **kwargs)
+
+    monkeypatch.setattr(api.transactions, "list_transactions", flaky)
+    errors: dict[str, Exception] = {}
+    transactions = list(
+        api.transactions.iter_merged_transactions(
+            ["KEY000000", "KEY000001"],
+            from_date=date(2024, 1, 1),
+            to_date=date(2024, 3, 31),
+            window_days=31,
+            errors=errors,
+        )
+    )
+
+    assert list(errors) == ["KEY000001"]
+    assert {t["accountKey"] for t in transactions} == {"KEY000000"}
+    assert len(transactions) == 91 * 5
+    dates = [t["date"] for t in transactions]
+    assert dates == sorted(dates)
+
+
+@pytest.mark.parametrize("group_size", [0, 1, 3])
+def test_merged_stream_covers_every_account(api: SpareBank1API, group_size: int):
+    transactions = list(
+        api.transactions.iter_merged_transactions(
+            KEYS,
+            from_date=date(2024, 1, 1),
+            to_date=date(2024, 1, 10),
+            group_size=group_size,
+        )
+    )
+    assert {t["accountKey"] for t in transactions} == set(KEYS)
+    assert len(transactions) == 4 * 10 * 5
+
+
+def test_failed_export_leaves_existing_file_untouched(api, mock_server, tmp_path):
+    path = tmp_path / "export.csv"
+    written = api.transactions.export_transactions_to_file(
+        "KEY000000", date(2024, 1, 1), date(2024, 1, 31), str(path)
+    )
+    assert written == path.stat().st_size > 0
+    previous = path.read_bytes()
+
+    mock_server.settings.error_rate = 1.0
+    api._base.scheduler.max_retries = 0
+    with pytest.raises(APIError):
+        _ = api.transactions.export_transactions_to_file(
+            "KEY000000", date(2024, 1, 1), date(2024, 1, 31), str(path)
+        )
+    assert path.read_bytes() == previous
+
+
+@pytest.fixture(params=["UTC", "Asia/Tokyo", "America/New_York"])
+def local_timezone(request, monkeypatch):
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize(
+    "timestamp, expected",
+    [
+        (1704063600000, date(2024, 1, 1)),  # 2023-12-31T23:00Z, CET midnight
+        (1719784800000, date(2024, 7, 1)),  # 2024-06-30T22:00Z, CEST midnight
+    ],
+)
+def test_booking_date_is_norwegian_calendar_day(local_timezone, timestamp, expected):
+    assert booking_date({"date": timestamp}) == expected
+    assert booking_date({}) is None
@@ -0,0 +1,100 @@
+import pytest
+
+from sparebank1api.api import SpareBank1API
+from sparebank1api.transfer_batch import (
+    TransferBatchExecutor,
+    TransferJournal,
+    TransferSpec,
+)
+
+
+def payroll(count: int) -> list[TransferSpec]:
+    return [
+        TransferSpec(f"payroll-{i}", "debit", 100.0 + i, "12340000000", "12340000001")
+        for i in range(count)
+    ]
+
+
+def test_resumed_batch_is_not_resubmitted(api: SpareBank1API, mock_server, tmp_path):
+    journal = str(tmp_path / "transfers.jsonl")
+    specs = payroll(5)
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        results, stats = executor.execute(specs)
+    assert [r.status for r in results] == ["succeeded"] * 5
+    assert stats["submitted"] == 5
+    assert mock_server.counts["POST"] == 5
+
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        resumed, stats = executor.execute(specs + payroll(6)[5:])
+    assert [r.resumed for r in resumed] == [True] * 5 + [False]
+    assert [r.result for r in resumed[:5]] == [r.result for r in results]
+    assert stats["submitted"] == 1
+    assert mock_server.counts["POST"] == 6
+
+
+def test_unknown_outcomes_are_in_doubt(api: SpareBank1API, mock_server, tmp_path):
+    journal = str(tmp_path / "transfers.jsonl")
+    specs = payroll(3)
+    mock_server.settings.error_rate = 1.0
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        results, stats = executor.execute(specs[:2])
+    assert [r.status for r in results] == ["in_doubt", "in_doubt"]
+    assert mock_server.counts["POST"] == 2  # never retried
+
+    mock_server.settings.error_rate = 0.0
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        # A run that crashed after journaling the intent
+        executor.journal.append(specs[2].key, "intent", spec=specs[2].to_dict())
+        results, stats = executor.execute(specs)
+        assert [r.status for r in results] == ["in_doubt"] * 3
+        assert results[2].error == "interrupted"
+        assert stats["submitted"] == 0
+        assert mock_server.counts["POST"] == 2
+
+        executor.resolve(specs[0].key, succeeded=True)
+        executor.resolve(specs[1].key, succeeded=False)
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        results, _ = executor.execute(specs)
+    assert [r.status for r in results] == ["succeeded", "failed", "in_doubt"]
+    assert mock_server.counts["POST"] == 2
+
+
+def test_changed_transfer_is_rejected(api: SpareBank1API, tmp_path):
+    journal = str(tmp_path / "transfers.jsonl")
+    spec = payroll(1)[0]
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        _ = executor.execute([spec])
+    changed = TransferSpec(spec.key, "debit", 999.0, spec.from_account, spec.to)
+    with TransferBatchExecutor(api.transfers, journal) as executor:
+        with pytest.raises(ValueError):
+            _ = executor.execute([changed])
+
+
+@pytest.mark.parametrize("tail", [b'{"key": "payroll-9", "sta', b"\x00\x00\x00\n"])
+def test_torn_journal_record_is_dropped(
+    api: SpareBank1API, mock_server, tmp_path, tail
+):
+    journal = tmp_path / "transfers.jsonl"
+    specs = payroll(2)
+    with TransferBatchExecutor(api.transfers, str(journal)) as executor:
+        _ = executor.execute(specs[:1])
+    complete = journal.read_bytes()
+    with open(journal, "ab") as f:
+        _ = f.write(tail)
+
+    with TransferBatchExecutor(api.transfers, str(journal)) as executor:
+        assert journal.read_bytes() == complete
+        results, stats = executor.execute(specs)
+    assert [r.status for r in results] == ["succeeded", "succeeded"]
+    assert stats["submitted"] == 1
+    assert mock_server.counts["POST"] == 2
+    # The next record starts on its own line
+    with TransferBatchExecutor(api.transfers, str(journal)) as executor:
+        assert set(executor.journal.outcomes) == {s.key for s in specs}
+
+
+def test_corrupt_journal_record_before_the_end_raises(tmp_path):
+    journal = tmp_path / "transfers.jsonl"
+    _ = journal.write_bytes(b'{"key": "a", "sta\n{"key": "a", "state": "failed"}\n')
+    with pytest.raises(ValueError):
+        _ = TransferJournal(str(journal))